@@ -4,7 +4,12 @@ from pathlib import Path
 
 
 BASE_DIR = Path(__file__).resolve().parent.parent
-load_dotenv(BASE_DIR / '.env')
+# load_dotenv never overrides variables that are already set, so child
+# processes (runserver's autoreloader, pytest workers) that inherit the
+# environment can skip re-reading and re-parsing the file.
+if not os.environ.get('_AVICENNA_DOTENV_LOADED'):
+    load_dotenv(BASE_DIR / '.env')
+    os.environ['_AVICENNA_DOTENV_LOADED'] = '1'
 
 SECRET_KEY = os.environ.get('SECRET_KEY', 'insecure-default-key')
 
@@ -100,7 +105,9 @@ USE_I18N = True
 USE_TZ = True
 
 STATIC_URL = '/static/'
-STATICFILES_DIRS = [BASE_DIR / 'static']
+# Only register the source dir when it exists, so the staticfiles finders
+# don't stat a missing directory on every lookup
+STATICFILES_DIRS = [BASE_DIR / 'static'] if (BASE_DIR / 'static').is_dir() else []
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
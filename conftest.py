@@ -6,6 +6,25 @@ from datetime import date, timedelta
 from decimal import Decimal
 from django.contrib.auth.models import User
 
+EXERCISE_ACTIVITIES = ('Running', 'Swimming', 'Cycling', 'Walking', 'Yoga', 'Weights', 'HIIT')
+
+
+def pytest_configure(config):
+    """Hash test passwords with MD5; PBKDF2's iterations dominate suite time."""
+    from django.conf import settings
+    settings.PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    """
+    Empty the cache after each test. Rolled-back tests reuse user ids, so
+    per-user cache keys would otherwise leak between them.
+    """
+    yield
+    from django.core.cache import cache
+    cache.clear()
+
 
 @pytest.fixture
 def user(db):
@@ -73,9 +92,8 @@ def weight_entry(db, user):
 def multiple_dietary_entries(db, user):
     """Create multiple dietary entries over several days."""
     from tracker.models import DietaryEntry
-    entries = []
-    for i in range(7):
-        entry = DietaryEntry.objects.create(
+    return DietaryEntry.objects.bulk_create([
+        DietaryEntry(
             user=user,
             date=date.today() - timedelta(days=i),
             item=f'Food item {i}',
@@ -83,48 +101,50 @@ def multiple_dietary_entries(db, user):
             notes=f'Notes for day {i}',
             remarks=f'Remarks for day {i}'
         )
-        entries.append(entry)
-    return entries
+        for i in range(7)
+    ])
 
 
 @pytest.fixture
 def multiple_exercise_entries(db, user):
     """Create multiple exercise entries over several days."""
     from tracker.models import ExerciseEntry
-    entries = []
-    activities = ['Running', 'Swimming', 'Cycling', 'Walking', 'Yoga', 'Weights', 'HIIT']
-    for i in range(7):
-        entry = ExerciseEntry.objects.create(
+    return ExerciseEntry.objects.bulk_create([
+        ExerciseEntry(
             user=user,
             date=date.today() - timedelta(days=i),
-            activity=activities[i],
+            activity=EXERCISE_ACTIVITIES[i],
             duration_minutes=20 + (i * 5),
             calories_burned=150 + (i * 25),
             remarks=f'Workout remarks {i}'
         )
-        entries.append(entry)
-    return entries
+        for i in range(7)
+    ])
 
 
 @pytest.fixture
 def multiple_weight_entries(db, user):
     """Create multiple weight entries over several days."""
     from tracker.models import WeightEntry
-    entries = []
-    for i in range(10):
-        entry = WeightEntry.objects.create(
+    return WeightEntry.objects.bulk_create([
+        WeightEntry(
             user=user,
             date=date.today() - timedelta(days=i),
             weight_kg=Decimal('75.00') - Decimal(str(i * 0.1)),
             notes=f'Weight notes {i}'
         )
-        entries.append(entry)
-    return entries
+        for i in range(10)
+    ])
 
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def sample_import_json():
-    """Sample JSON data for import testing."""
+    """
+    Sample JSON data for import testing.
+
+    Built once per session and shared between tests, so treat it as
+    read-only; use copy.deepcopy() first if a test needs to modify it.
+    """
     return [
         {
             "date": str(date.today()),
@@ -5,17 +5,6 @@ Run: python import_activity_log.py
 """
 import os
 import sys
-import django
-
-# Setup Django
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'avicenna_project.settings')
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-django.setup()
-
-from django.contrib.auth import get_user_model
-from tracker.models import DietaryEntry, ExerciseEntry
-
-User = get_user_model()
 
 # Your activity log data
 DATA = [
@@ -116,6 +105,19 @@ DATA = [
 
 
 def main():
+    # Setup Django here rather than at import time, so DATA can be imported
+    # without paying for app registry initialization
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'avicenna_project.settings')
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import django
+    django.setup()
+
+    from django.contrib.auth import get_user_model
+    from django.db import transaction
+    from tracker.models import DietaryEntry, ExerciseEntry, bump_entry_version
+
+    User = get_user_model()
+
     # Get or create a default user
     user = User.objects.first()
     if not user:
@@ -125,8 +127,8 @@ def main():
 
     print(f"Importing data for user: {user.username}")
 
-    dietary_count = 0
-    exercise_count = 0
+    dietary_objs = []
+    exercise_objs = []
 
     for day in DATA:
         date = day['date']
@@ -134,27 +136,35 @@ def main():
 
         # Import food items
         for food in day.get('food', []):
-            DietaryEntry.objects.create(
+            dietary_objs.append(DietaryEntry(
                 user=user,
                 date=date,
                 item=food['item'],
                 calories=food['calories'],
                 notes=food.get('note', ''),
                 remarks=remarks
-            )
-            dietary_count += 1
+            ))
 
         # Import exercise entries
         for ex in day.get('exercise', []):
-            ExerciseEntry.objects.create(
+            exercise_objs.append(ExerciseEntry(
                 user=user,
                 date=date,
                 activity=ex['activity'],
                 duration_minutes=ex['duration_min'],
                 calories_burned=ex.get('calories_burned'),
                 remarks=remarks
-            )
-            exercise_count += 1
+            ))
+
+    # One multi-row INSERT per model instead of one round-trip per entry
+    with transaction.atomic():
+        DietaryEntry.objects.bulk_create(dietary_objs, batch_size=500)
+        ExerciseEntry.objects.bulk_create(exercise_objs, batch_size=500)
+        # bulk_create sends no post_save, so invalidate cached charts/recaps here
+        bump_entry_version(user.id)
+
+    dietary_count = len(dietary_objs)
+    exercise_count = len(exercise_objs)
 
     print(f"\n✅ Import complete!")
     print(f"   - Dietary entries: {dietary_count}")
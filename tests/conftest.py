@@ -6,63 +6,132 @@ from datetime import date, timedelta
 from decimal import Decimal
 
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import Group
 
 from tracker.models import DietaryEntry, ExerciseEntry, WeightEntry, UserProfile
 
 User = get_user_model()
 
+# fixture name -> (username, email, password, is_superuser) for shared_users
+STANDARD_ACCOUNTS = {
+    'user': ('testuser', 'test@example.com', 'testpass123', False),
+    'user2': ('partner', 'partner@example.com', 'partnerpass123', False),
+    'admin_user': ('admin', 'admin@example.com', 'adminpass123', True),
+    'special_user': ('specialuser', 'special@example.com', 'specialpass123', False),
+}
+
+# Extra plain accounts for tests that need several interchangeable users
+POOL_USERNAMES = ('special1', 'special2')
+POOL_PASSWORD = 'pass123'
+
+# (item, calories) logged every day by the dietary_entries fixture
+DAILY_FOODS = (
+    ('Breakfast', 400),
+    ('Lunch', 600),
+    ('Dinner', 700),
+    ('Snack', 200),
+)
+
+# (activity, duration_minutes, calories_burned) logged every day by exercise_entries
+DAILY_ACTIVITIES = (
+    ('Running', 30, 300),
+    ('Walking', 45, 150),
+    ('Cycling', 60, 400),
+)
+
+
+@pytest.fixture(scope='session')
+def special_group(django_db_setup, django_db_blocker):
+    """
+    Return the 'special' group for FOR_HER mode.
+
+    The group is seeded by a data migration, so it is looked up once per
+    session; tests only add or remove membership rows, which roll back.
+    """
+    with django_db_blocker.unblock():
+        group, _ = Group.objects.get_or_create(name='special')
+    return group
+
+
+@pytest.fixture(scope='package')
+def shared_users(django_db_setup, django_db_blocker, special_group):
+    """
+    Create the standard test accounts once for the whole ``tests`` package.
+
+    Every test still runs inside pytest-django's per-test transaction, so
+    anything a test changes on these rows is rolled back when it finishes.
+    Only primary keys are handed out; the per-test fixtures below re-fetch
+    the rows so no cached Python state leaks from one test to the next.
+
+    The rows themselves are committed outside those transactions, so the
+    usernames in STANDARD_ACCOUNTS and POOL_USERNAMES are reserved while
+    this package runs: tests must not create_user() them or count every
+    User. Leftovers from an interrupted --reuse-db run are deleted first,
+    and the accounts are deleted again on teardown.
+    """
+    # Hash each distinct password once and insert every account, then every
+    # profile, in one statement each; bulk_create skips the post_save hook
+    # that would otherwise add the profiles
+    accounts = dict(STANDARD_ACCOUNTS)
+    accounts.update((name, (name, '', POOL_PASSWORD, False)) for name in POOL_USERNAMES)
+    passwords = {password for _, _, password, _ in accounts.values()}
+    hashes = {password: make_password(password) for password in passwords}
+    usernames = [username for username, _, _, _ in accounts.values()]
+    with django_db_blocker.unblock():
+        User.objects.filter(username__in=usernames).delete()
+        created = User.objects.bulk_create([
+            User(
+                username=username,
+                email=email,
+                password=hashes[password],
+                is_staff=is_superuser,
+                is_superuser=is_superuser,
+            )
+            for username, email, password, is_superuser in accounts.values()
+        ])
+        users = dict(zip(accounts, created))
+        UserProfile.objects.bulk_create([UserProfile(user=u) for u in created])
+        users['special_user'].groups.add(special_group)
+
+    yield {name: u.pk for name, u in users.items()}
+
+    with django_db_blocker.unblock():
+        # Cascades to the profiles and group memberships
+        User.objects.filter(username__in=usernames).delete()
+
 
 @pytest.fixture
-def user(db):
-    """Create a standard test user."""
-    user = User.objects.create_user(
-        username='testuser',
-        email='test@example.com',
-        password='testpass123'
-    )
-    return user
+def user(db, shared_users):
+    """Return the standard test user."""
+    return User.objects.get(pk=shared_users['user'])
 
 
 @pytest.fixture
-def user2(db):
-    """Create a second test user (for couples mode testing)."""
-    user = User.objects.create_user(
-        username='partner',
-        email='partner@example.com',
-        password='partnerpass123'
-    )
-    return user
+def user2(db, shared_users):
+    """Return a second test user (for couples mode testing)."""
+    return User.objects.get(pk=shared_users['user2'])
 
 
 @pytest.fixture
-def admin_user(db):
-    """Create an admin/superuser."""
-    user = User.objects.create_superuser(
-        username='admin',
-        email='admin@example.com',
-        password='adminpass123'
+def user_pool(db, shared_users):
+    """Return the pool accounts (``special1``, ``special2``), in that order."""
+    return list(
+        User.objects.filter(pk__in=[shared_users[name] for name in POOL_USERNAMES])
+        .order_by('username')
     )
-    return user
 
 
 @pytest.fixture
-def special_group(db):
-    """Create the 'special' group for FOR_HER mode."""
-    group, _ = Group.objects.get_or_create(name='special')
-    return group
+def admin_user(db, shared_users):
+    """Return an admin/superuser."""
+    return User.objects.get(pk=shared_users['admin_user'])
 
 
 @pytest.fixture
-def special_user(db, special_group):
-    """Create a user in the 'special' group."""
-    user = User.objects.create_user(
-        username='specialuser',
-        email='special@example.com',
-        password='specialpass123'
-    )
-    user.groups.add(special_group)
-    return user
+def special_user(db, shared_users):
+    """Return a user in the 'special' group."""
+    return User.objects.get(pk=shared_users['special_user'])
 
 
 @pytest.fixture
@@ -77,6 +146,14 @@ def linked_partners(db, user, user2):
     return user, user2
 
 
+@pytest.fixture
+def linked_partners_prefetched(linked_partners):
+    """Linked partners, with the user's profile, partner and partner profile loaded in one query."""
+    user, partner = linked_partners
+    user = User.objects.select_related('profile__partner__profile').get(pk=user.pk)
+    return user, partner
+
+
 @pytest.fixture
 def dietary_entry(db, user):
     """Create a single dietary entry."""
@@ -93,27 +170,19 @@ def dietary_entry(db, user):
 @pytest.fixture
 def dietary_entries(db, user):
     """Create multiple dietary entries across several days."""
-    entries = []
     today = date.today()
-    foods = [
-        ('Breakfast', 400),
-        ('Lunch', 600),
-        ('Dinner', 700),
-        ('Snack', 200),
-    ]
-    for i in range(7):
-        entry_date = today - timedelta(days=i)
-        for item, calories in foods:
-            entry = DietaryEntry.objects.create(
-                user=user,
-                date=entry_date,
-                item=f'{item} Day {i}',
-                calories=calories,
-                notes=f'Notes for {item}',
-                remarks=f'Day {i} remarks'
-            )
-            entries.append(entry)
-    return entries
+    return DietaryEntry.objects.bulk_create([
+        DietaryEntry(
+            user=user,
+            date=today - timedelta(days=i),
+            item=f'{item} Day {i}',
+            calories=calories,
+            notes=f'Notes for {item}',
+            remarks=f'Day {i} remarks'
+        )
+        for i in range(7)
+        for item, calories in DAILY_FOODS
+    ])
 
 
 @pytest.fixture
@@ -132,26 +201,19 @@ def exercise_entry(db, user):
 @pytest.fixture
 def exercise_entries(db, user):
     """Create multiple exercise entries across several days."""
-    entries = []
     today = date.today()
-    activities = [
-        ('Running', 30, 300),
-        ('Walking', 45, 150),
-        ('Cycling', 60, 400),
-    ]
-    for i in range(7):
-        entry_date = today - timedelta(days=i)
-        for activity, duration, calories in activities:
-            entry = ExerciseEntry.objects.create(
-                user=user,
-                date=entry_date,
-                activity=f'{activity} Day {i}',
-                duration_minutes=duration,
-                calories_burned=calories,
-                remarks=f'Day {i} exercise'
-            )
-            entries.append(entry)
-    return entries
+    return ExerciseEntry.objects.bulk_create([
+        ExerciseEntry(
+            user=user,
+            date=today - timedelta(days=i),
+            activity=f'{activity} Day {i}',
+            duration_minutes=duration,
+            calories_burned=calories,
+            remarks=f'Day {i} exercise'
+        )
+        for i in range(7)
+        for activity, duration, calories in DAILY_ACTIVITIES
+    ])
 
 
 @pytest.fixture
@@ -168,34 +230,78 @@ def weight_entry(db, user):
 @pytest.fixture
 def weight_entries(db, user):
     """Create multiple weight entries across several days."""
-    entries = []
     today = date.today()
     base_weight = Decimal('70.0')
-    for i in range(10):
-        entry_date = today - timedelta(days=i)
-        # Simulate slight weight fluctuations
-        weight = base_weight + Decimal(str(i * 0.1))
-        entry = WeightEntry.objects.create(
+    # Simulate slight weight fluctuations
+    return WeightEntry.objects.bulk_create([
+        WeightEntry(
             user=user,
-            date=entry_date,
-            weight_kg=weight,
+            date=today - timedelta(days=i),
+            weight_kg=base_weight + Decimal(str(i * 0.1)),
             notes=f'Day {i} weight'
         )
-        entries.append(entry)
-    return entries
+        for i in range(10)
+    ])
+
+
+@pytest.fixture(scope='class')
+def readonly_user(django_db_setup, django_db_blocker):
+    """
+    Owner of the class-scoped read-only entry fixtures below.
+
+    The rows are committed outside the per-test transactions and live for
+    the whole test class, so tests using them must only read. Deleting the
+    user at teardown cascades to the entries.
+    """
+    with django_db_blocker.unblock():
+        user = User.objects.create_user(username='readonly', password='readonly123')
+    yield user
+    with django_db_blocker.unblock():
+        user.delete()
+
+
+@pytest.fixture(scope='class')
+def dietary_entries_ro(readonly_user, django_db_blocker):
+    """Five dietary entries on consecutive days, shared by a test class."""
+    today = date.today()
+    with django_db_blocker.unblock():
+        return DietaryEntry.objects.bulk_create([
+            DietaryEntry(
+                user=readonly_user,
+                date=today - timedelta(days=i),
+                item=f'Food {i}',
+                calories=100 + i
+            )
+            for i in range(5)
+        ])
+
+
+@pytest.fixture(scope='class')
+def weight_entries_ro(readonly_user, django_db_blocker):
+    """Five weight entries on consecutive days, shared by a test class."""
+    today = date.today()
+    with django_db_blocker.unblock():
+        return WeightEntry.objects.bulk_create([
+            WeightEntry(
+                user=readonly_user,
+                date=today - timedelta(days=i),
+                weight_kg=Decimal('70.0') + Decimal(i) / 10
+            )
+            for i in range(5)
+        ])
 
 
 @pytest.fixture
 def authenticated_client(client, user):
     """Return a logged-in test client."""
-    client.login(username='testuser', password='testpass123')
+    client.force_login(user)
     return client
 
 
 @pytest.fixture
 def admin_client(client, admin_user):
     """Return a logged-in admin client."""
-    client.login(username='admin', password='adminpass123')
+    client.force_login(admin_user)
     return client
 
 
@@ -5,7 +5,7 @@ import pytest
 from datetime import date
 from decimal import Decimal
 
-from django.urls import reverse
+from django.urls import resolve, reverse
 from django.contrib.auth import get_user_model
 from django.contrib.admin.sites import AdminSite
 
@@ -17,6 +17,37 @@ from tracker.models import DietaryEntry, ExerciseEntry, WeightEntry, UserProfile
 
 User = get_user_model()
 
+TODAY_STR = date.today().isoformat()
+
+# Admin add-form payloads for TestAdminCRUD; tests merge in the owning user
+DIETARY_ADD_DATA = {
+    'date': TODAY_STR,
+    'item': 'Admin Created Food',
+    'calories': 600,
+    'notes': 'Created via admin',
+    'remarks': 'Test remarks',
+    '_continue': '',
+}
+EXERCISE_ADD_DATA = {
+    'date': TODAY_STR,
+    'activity': 'Admin Created Exercise',
+    'duration_minutes': 45,
+    'calories_burned': 350,
+    'remarks': 'Test remarks',
+    '_continue': '',
+}
+WEIGHT_ADD_DATA = {
+    'date': TODAY_STR,
+    'weight_kg': '68.5',
+    'notes': 'Created via admin',
+    '_continue': '',
+}
+
+
+def created_pk(response):
+    """Primary key of the object an admin add view redirected to (needs ``_continue``)."""
+    return int(resolve(response['Location']).kwargs['object_id'])
+
 
 class TestUserProfileInline:
     """Tests for UserProfile inline admin."""
@@ -32,16 +63,14 @@ class TestUserProfileInline:
         url = reverse('admin:auth_user_change', args=[user.pk])
         response = admin_client.get(url)
 
-        content = response.content.decode()
-        assert 'Profile' in content
+        assert b'Profile' in response.content
 
     def test_user_edit_shows_partner_field(self, admin_client, user, user2):
         """User edit page should show partner field."""
         url = reverse('admin:auth_user_change', args=[user.pk])
         response = admin_client.get(url)
 
-        content = response.content.decode()
-        assert 'partner' in content.lower()
+        assert b'partner' in response.content.lower()
 
     def test_can_set_partner_via_admin(self, admin_client, user, user2):
         """Admin should be able to set partner via user edit page."""
@@ -92,14 +121,13 @@ class TestDietaryEntryAdmin:
         url = reverse('admin:tracker_dietaryentry_changelist')
         response = admin_client.get(url)
 
-        content = response.content.decode()
-        assert dietary_entry.item in content
-        assert str(dietary_entry.calories) in content
+        assert dietary_entry.item.encode() in response.content
+        assert str(dietary_entry.calories).encode() in response.content
 
     def test_dietary_entry_can_filter_by_date(self, admin_client, dietary_entries):
         """Dietary entry list should support date filtering."""
         url = reverse('admin:tracker_dietaryentry_changelist')
-        today = date.today().strftime('%Y-%m-%d')
+        today = TODAY_STR
         response = admin_client.get(f'{url}?date__gte={today}')
 
         assert response.status_code == 200
@@ -118,8 +146,7 @@ class TestDietaryEntryAdmin:
         response = admin_client.get(f'{url}?q=Test')
 
         assert response.status_code == 200
-        content = response.content.decode()
-        assert 'Test Food' in content
+        assert b'Test Food' in response.content
 
 
 class TestExerciseEntryAdmin:
@@ -142,9 +169,8 @@ class TestExerciseEntryAdmin:
         url = reverse('admin:tracker_exerciseentry_changelist')
         response = admin_client.get(url)
 
-        content = response.content.decode()
-        assert exercise_entry.activity in content
-        assert str(exercise_entry.duration_minutes) in content
+        assert exercise_entry.activity.encode() in response.content
+        assert str(exercise_entry.duration_minutes).encode() in response.content
 
     def test_exercise_entry_searchable(self, admin_client, exercise_entry):
         """Exercise entry should be searchable by activity."""
@@ -152,8 +178,7 @@ class TestExerciseEntryAdmin:
         response = admin_client.get(f'{url}?q=Running')
 
         assert response.status_code == 200
-        content = response.content.decode()
-        assert 'Running' in content
+        assert b'Running' in response.content
 
 
 class TestWeightEntryAdmin:
@@ -176,13 +201,12 @@ class TestWeightEntryAdmin:
         url = reverse('admin:tracker_weightentry_changelist')
         response = admin_client.get(url)
 
-        content = response.content.decode()
-        assert '70.5' in content
+        assert b'70.5' in response.content
 
     def test_weight_entry_can_filter_by_date(self, admin_client, weight_entries):
         """Weight entry list should support date filtering."""
         url = reverse('admin:tracker_weightentry_changelist')
-        today = date.today().strftime('%Y-%m-%d')
+        today = TODAY_STR
         response = admin_client.get(f'{url}?date__gte={today}')
 
         assert response.status_code == 200
@@ -212,10 +236,10 @@ class TestAdminPermissions:
         url = reverse('admin:index')
         response = admin_client.get(url)
 
-        content = response.content.decode()
-        assert 'Dietary entry' in content or 'Dietary entrys' in content
-        assert 'Exercise entry' in content or 'Exercise entrys' in content
-        assert 'Weight entry' in content or 'Weight entrys' in content
+        content = response.content
+        assert b'Dietary entry' in content or b'Dietary entrys' in content
+        assert b'Exercise entry' in content or b'Exercise entrys' in content
+        assert b'Weight entry' in content or b'Weight entrys' in content
 
 
 class TestAdminCRUD:
@@ -224,58 +248,39 @@ class TestAdminCRUD:
     def test_create_dietary_entry_via_admin(self, admin_client, user):
         """Admin should be able to create dietary entry."""
         url = reverse('admin:tracker_dietaryentry_add')
-        data = {
-            'user': user.pk,
-            'date': date.today().strftime('%Y-%m-%d'),
-            'item': 'Admin Created Food',
-            'calories': 600,
-            'notes': 'Created via admin',
-            'remarks': 'Test remarks',
-        }
+        data = {**DIETARY_ADD_DATA, 'user': user.pk}
         response = admin_client.post(url, data)
 
-        # Should redirect on success
+        # Should redirect to the new entry's change page on success
         assert response.status_code == 302
 
         # Verify entry was created
-        entry = DietaryEntry.objects.filter(item='Admin Created Food').first()
-        assert entry is not None
+        entry = DietaryEntry.objects.get(pk=created_pk(response))
+        assert entry.item == 'Admin Created Food'
         assert entry.calories == 600
 
     def test_create_exercise_entry_via_admin(self, admin_client, user):
         """Admin should be able to create exercise entry."""
         url = reverse('admin:tracker_exerciseentry_add')
-        data = {
-            'user': user.pk,
-            'date': date.today().strftime('%Y-%m-%d'),
-            'activity': 'Admin Created Exercise',
-            'duration_minutes': 45,
-            'calories_burned': 350,
-            'remarks': 'Test remarks',
-        }
+        data = {**EXERCISE_ADD_DATA, 'user': user.pk}
         response = admin_client.post(url, data)
 
         assert response.status_code == 302
 
-        entry = ExerciseEntry.objects.filter(activity='Admin Created Exercise').first()
-        assert entry is not None
+        entry = ExerciseEntry.objects.get(pk=created_pk(response))
+        assert entry.activity == 'Admin Created Exercise'
         assert entry.duration_minutes == 45
 
     def test_create_weight_entry_via_admin(self, admin_client, user):
         """Admin should be able to create weight entry."""
         url = reverse('admin:tracker_weightentry_add')
-        data = {
-            'user': user.pk,
-            'date': date.today().strftime('%Y-%m-%d'),
-            'weight_kg': '68.5',
-            'notes': 'Created via admin',
-        }
+        data = {**WEIGHT_ADD_DATA, 'user': user.pk}
         response = admin_client.post(url, data)
 
         assert response.status_code == 302
 
-        entry = WeightEntry.objects.filter(weight_kg=Decimal('68.5')).first()
-        assert entry is not None
+        entry = WeightEntry.objects.get(pk=created_pk(response))
+        assert entry.weight_kg == Decimal('68.5')
 
     def test_delete_dietary_entry_via_admin(self, admin_client, dietary_entry):
         """Admin should be able to delete dietary entry."""
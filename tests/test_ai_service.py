@@ -0,0 +1,319 @@
+"""
+Tests for tracker.ai_service, run against a fake OpenAI client.
+"""
+import io
+import json
+import os
+import pytest
+from datetime import date
+from types import SimpleNamespace
+
+from django.urls import reverse
+
+from tracker import ai_service
+from tracker.ai_service import AIFoodLogService, _StreamedItemScanner, prepare_image
+from tracker.models import AIUsage
+
+REPLY = {
+    'date': '2026-01-01',
+    'dietary': [{'item': 'Nasi lemak', 'calories': 650, 'notes': 'with egg'}],
+    'exercise': [],
+    'remarks': 'lunch',
+}
+
+
+class FakeCompletions:
+    """
+    Stands in for client.chat.completions: records each create() call and
+    answers it with the next queued reply. A queued exception is raised, and
+    a streamed call gets its reply back as a list of chunks.
+    """
+
+    def __init__(self):
+        self.replies = []
+        self.calls = []
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        reply = self.replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        if kwargs.get('stream'):
+            pieces = [reply[i:i + 7] for i in range(0, len(reply), 7)]
+            return [SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=p))]) for p in pieces]
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=reply))])
+
+
+@pytest.fixture
+def completions(monkeypatch):
+    """Route AIFoodLogService's OpenAI client to a FakeCompletions."""
+    fake = FakeCompletions()
+    client = SimpleNamespace(chat=SimpleNamespace(completions=fake))
+    monkeypatch.setenv('OPENAI_API_KEY', 'test-key')
+    monkeypatch.setattr(ai_service, 'get_openai_client', lambda api_key: client)
+    return fake
+
+
+def coach_context(calories_today):
+    """A coach profile with ``calories_today`` eaten out of 2000."""
+    return {
+        'goal': 'lose',
+        'daily_calorie_goal': 2000,
+        'calories_today': calories_today,
+        'calories_remaining': 2000 - calories_today,
+    }
+
+
+class TestPrompt:
+    """Tests for the messages sent to the model."""
+
+    @pytest.mark.parametrize('context', [None, coach_context(500)])
+    def test_date_pinned_to_today(self, completions, context):
+        """Both prompts tell the model to use the supplied date, and supply today's."""
+        messages = AIFoodLogService(context)._completion_kwargs('x')['messages']
+
+        assert 'Always set "date" to the Date given' in messages[0]['content']
+        assert messages[1]['content'].startswith(f'Date: {date.today().isoformat()}')
+
+
+class TestParseCache:
+    """Tests for reusing parse results across identical requests."""
+
+    def test_identical_request_is_served_from_cache(self, completions):
+        """A repeat of the same text and context makes no second API call."""
+        completions.replies = [json.dumps(REPLY)]
+
+        first = AIFoodLogService(coach_context(500)).parse_text_input('nasi lemak')
+        second = AIFoodLogService(coach_context(500)).parse_text_input('nasi lemak')
+
+        assert first == second == {'success': True, 'data': REPLY}
+        assert len(completions.calls) == 1
+
+    def test_different_text_misses_cache(self, completions):
+        """Another description is sent to the API."""
+        completions.replies = [json.dumps(REPLY), json.dumps(REPLY)]
+
+        AIFoodLogService().parse_text_input('nasi lemak')
+        AIFoodLogService().parse_text_input('roti canai')
+
+        assert len(completions.calls) == 2
+
+    def test_different_prompt_context_misses_cache(self, completions):
+        """Different calorie counts reach the model as-is and don't share a reply."""
+        completions.replies = [json.dumps(REPLY), json.dumps(REPLY)]
+
+        AIFoodLogService(coach_context(1180)).parse_text_input('nasi lemak')
+        AIFoodLogService(coach_context(1215)).parse_text_input('nasi lemak')
+
+        sent = [call['messages'][1]['content'] for call in completions.calls]
+        assert 'eaten today 1180 kcal' in sent[0]
+        assert 'eaten today 1215 kcal' in sent[1]
+
+    def test_same_image_is_served_from_cache(self, completions):
+        """Re-uploading the same photo with the same context reuses the reply."""
+        completions.replies = [json.dumps(REPLY), json.dumps(REPLY)]
+        service = AIFoodLogService()
+
+        service.parse_image_input(b'jpeg-bytes', 'image/jpeg', 'lunch')
+        service.parse_image_input(b'jpeg-bytes', 'image/jpeg', 'lunch')
+        service.parse_image_input(b'other-bytes', 'image/jpeg', 'lunch')
+
+        assert len(completions.calls) == 2
+
+    def test_api_errors_are_not_cached(self, completions):
+        """A failed call is retried on the next request."""
+        completions.replies = [RuntimeError('timeout'), json.dumps(REPLY)]
+        service = AIFoodLogService()
+
+        assert service.parse_text_input('nasi lemak')['success'] is False
+        assert service.parse_text_input('nasi lemak')['success'] is True
+        assert len(completions.calls) == 2
+
+    def test_error_replies_are_not_cached(self, completions):
+        """An {"error": ...} reply from the model is not reused either."""
+        completions.replies = [json.dumps({'error': 'Could not identify any trackable items'}), json.dumps(REPLY)]
+        service = AIFoodLogService()
+
+        assert service.parse_text_input('blurry')['success'] is False
+        assert service.parse_text_input('blurry') == {'success': True, 'data': REPLY}
+
+
+def scan(text, chunk_size):
+    """Feed ``text`` to a scanner ``chunk_size`` characters at a time."""
+    scanner = _StreamedItemScanner(('dietary', 'exercise'))
+    found = []
+    for i in range(0, len(text), chunk_size):
+        found.extend(scanner.feed(text[i:i + chunk_size]))
+    return scanner, found
+
+
+class TestStreamedItemScanner:
+    """Tests for pulling finished items out of a partially streamed reply."""
+
+    @pytest.mark.parametrize('chunk_size', [1, 3, 1000])
+    def test_items_found_across_chunk_boundaries(self, chunk_size):
+        """Every item is reported once, however the reply is split."""
+        reply = json.dumps({
+            'date': '2026-01-01',
+            'dietary': [{'item': 'Rice', 'calories': 200}, {'item': 'Egg', 'calories': 90}],
+            'exercise': [{'activity': 'Run', 'duration_minutes': 30, 'calories_burned': 300}],
+            'remarks': 'lunch',
+        })
+
+        scanner, found = scan(reply, chunk_size)
+
+        assert found == [
+            ('dietary', {'item': 'Rice', 'calories': 200}),
+            ('dietary', {'item': 'Egg', 'calories': 90}),
+            ('exercise', {'activity': 'Run', 'duration_minutes': 30, 'calories_burned': 300}),
+        ]
+        assert scanner.text == reply
+
+    def test_escaped_quotes_and_braces_inside_strings(self):
+        """Quotes, braces and brackets inside string values don't end an item."""
+        item = {'item': 'Curry {extra} [spicy]', 'calories': 400, 'notes': 'said "large" \\ }'}
+        reply = json.dumps({'dietary': [item], 'exercise': []})
+
+        _, found = scan(reply, 2)
+
+        assert found == [('dietary', item)]
+
+    def test_key_name_used_as_value(self):
+        """A value that happens to equal a watched key is not treated as the array."""
+        reply = json.dumps({
+            'remarks': 'dietary',
+            'other': [{'item': 'ignored'}],
+            'exercise': [{'activity': 'Yoga', 'duration_minutes': 20}],
+        })
+
+        _, found = scan(reply, 4)
+
+        assert found == [('exercise', {'activity': 'Yoga', 'duration_minutes': 20})]
+
+    def test_error_reply_yields_no_items(self):
+        """An {"error": ...} reply produces no items; the full text is kept for parsing."""
+        reply = json.dumps({'error': 'Could not identify any trackable items'})
+
+        scanner, found = scan(reply, 5)
+
+        assert found == []
+        assert json.loads(scanner.text) == {'error': 'Could not identify any trackable items'}
+
+
+def read_events(response):
+    """Split a text/event-stream response into (event, data) pairs."""
+    body = b''.join(response.streaming_content).decode()
+    events = []
+    for block in body.strip().split('\n\n'):
+        lines = dict(line.split(': ', 1) for line in block.split('\n'))
+        events.append((lines['event'], json.loads(lines['data'])))
+    return events
+
+
+class TestStreamedParse:
+    """Tests for the streamed parse path and its Server-Sent Events view."""
+
+    def test_cached_result_replayed_as_events(self, completions):
+        """A cache hit yields the same item and result events without an API call."""
+        completions.replies = [json.dumps(REPLY)]
+        service = AIFoodLogService()
+
+        first = list(service.stream_text_input('nasi lemak'))
+        second = list(service.stream_text_input('nasi lemak'))
+
+        assert second == first == [
+            ('item', {'kind': 'dietary', 'item': REPLY['dietary'][0]}),
+            ('result', {'success': True, 'data': REPLY}),
+        ]
+        assert len(completions.calls) == 1
+        assert completions.calls[0]['stream'] is True
+
+    def test_view_streams_items_then_result(self, client, user, completions):
+        """The view sends item events, then one result event, and logs usage once."""
+        user.profile.ai_enabled = True
+        user.profile.save()
+        client.force_login(user)
+        completions.replies = [json.dumps(REPLY)]
+
+        response = client.post(
+            reverse('tracker:ai_parse_food'), {'text': 'nasi lemak'},
+            HTTP_ACCEPT='text/event-stream'
+        )
+
+        assert response['Content-Type'] == 'text/event-stream'
+        events = read_events(response)
+        assert events[0] == ('item', {'kind': 'dietary', 'item': REPLY['dietary'][0]})
+        assert events[-1][0] == 'result'
+        assert events[-1][1]['success'] is True
+        assert events[-1][1]['data'] == REPLY
+        assert 'remaining' in events[-1][1]
+        assert AIUsage.objects.filter(user=user).count() == 1
+
+
+def encode(img, format, **params):
+    """Serialize a Pillow image to bytes."""
+    buffer = io.BytesIO()
+    img.save(buffer, format, **params)
+    return buffer.getvalue()
+
+
+def noise(mode, size):
+    """An incompressible image, so its encoded size is well over the resize threshold."""
+    from PIL import Image
+    return Image.frombytes(mode, size, os.urandom(size[0] * size[1] * len(mode)))
+
+
+class TestPrepareImage:
+    """Tests for shrinking photos before upload."""
+
+    @pytest.fixture(autouse=True)
+    def pillow(self):
+        return pytest.importorskip('PIL')
+
+    def test_large_upload_resized_to_jpeg(self):
+        """A big photo is scaled to MAX_IMAGE_EDGE and re-encoded as JPEG."""
+        from PIL import Image
+        data = encode(noise('RGB', (1400, 1050)), 'PNG')
+
+        out, content_type, detail = prepare_image(data, 'image/png')
+
+        assert content_type == 'image/jpeg'
+        assert detail == 'high'
+        assert len(out) < len(data)
+        assert Image.open(io.BytesIO(out)).size == (1024, 768)
+
+    def test_small_image_passed_through_as_low_detail(self):
+        """An image that fits one low-detail tile is sent unchanged."""
+        data = encode(noise('RGB', (400, 300)), 'PNG')
+
+        assert prepare_image(data, 'image/png') == (data, 'image/png', 'low')
+
+    def test_exif_rotation_applied(self):
+        """A photo stored sideways with an EXIF orientation comes out upright."""
+        from PIL import Image
+        exif = Image.Exif()
+        exif[0x0112] = 6  # Orientation: rotate 90 degrees clockwise to display
+        data = encode(noise('RGB', (1200, 600)), 'JPEG', quality=95, exif=exif)
+
+        out, _, _ = prepare_image(data, 'image/jpeg')
+
+        assert Image.open(io.BytesIO(out)).size == (512, 1024)
+
+    def test_transparent_background_becomes_white(self):
+        """Transparent pixels are flattened onto white, not black."""
+        from PIL import Image
+        img = noise('RGBA', (800, 600))
+        img.putalpha(0)
+        data = encode(img, 'PNG')
+
+        out, content_type, _ = prepare_image(data, 'image/png')
+
+        assert content_type == 'image/jpeg'
+        r, g, b = Image.open(io.BytesIO(out)).getpixel((100, 100))
+        assert min(r, g, b) > 245
+
+    def test_unreadable_file_sent_unchanged(self):
+        """Bytes Pillow cannot decode fall back to the original upload."""
+        data = b'not an image' * 50_000
+
+        assert prepare_image(data, 'image/webp') == (data, 'image/webp', 'high')
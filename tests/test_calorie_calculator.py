@@ -0,0 +1,77 @@
+"""
+Tests for the calorie status helpers in tracker.calorie_calculator.
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from tracker.calorie_calculator import bulk_calorie_status, get_calorie_status
+from tracker.models import DietaryEntry, WeightEntry
+
+User = get_user_model()
+
+
+def fill_profile(user, goal='lose'):
+    """Give ``user`` a complete calorie profile and a weight history."""
+    profile = user.profile
+    profile.fitness_goal = goal
+    profile.age = 30
+    profile.gender = 'female'
+    profile.height_cm = Decimal('165.0')
+    profile.activity_level = 'light'
+    profile.save()
+    WeightEntry.objects.create(user=user, date=date.today() - timedelta(days=3), weight_kg=Decimal('70.00'))
+    WeightEntry.objects.create(user=user, date=date.today(), weight_kg=Decimal('68.00'))
+
+
+class TestBulkCalorieStatus:
+    """Tests for bulk_calorie_status and get_calorie_status."""
+
+    def test_matches_single_user_status(self, user, user2):
+        """The bulk result equals get_calorie_status for every user."""
+        fill_profile(user, 'lose')
+        fill_profile(user2, 'gain')
+        # Same "today" as get_calorie_status, which uses timezone.now().date()
+        today = timezone.now().date()
+        DietaryEntry.objects.create(user=user, date=today, item='Lunch', calories=600)
+        DietaryEntry.objects.create(user=user, date=today, item='Dinner', calories=700)
+        DietaryEntry.objects.create(user=user, date=today - timedelta(days=1), item='Old', calories=900)
+
+        statuses = bulk_calorie_status(User.objects.filter(pk__in=[user.pk, user2.pk]))
+
+        assert statuses[user.pk] == get_calorie_status(user)
+        assert statuses[user2.pk] == get_calorie_status(user2)
+        assert statuses[user.pk]['calories_consumed'] == 1300
+        assert statuses[user2.pk]['calories_consumed'] == 0
+
+    def test_uses_latest_weight(self, user):
+        """The daily goal is computed from the most recent weigh-in."""
+        fill_profile(user, 'maintain')
+
+        status = bulk_calorie_status(User.objects.filter(pk=user.pk))[user.pk]
+
+        # Mifflin-St Jeor for 68 kg, 165 cm, 30 y, female, light activity
+        assert status['daily_goal'] == round((10 * 68 + 6.25 * 165 - 5 * 30 - 161) * 1.375)
+
+    def test_none_for_incomplete_profiles(self, user, user2):
+        """Users without a full profile or any weigh-in get None."""
+        fill_profile(user2)
+        WeightEntry.objects.filter(user=user2).delete()
+
+        statuses = bulk_calorie_status(User.objects.filter(pk__in=[user.pk, user2.pk]))
+
+        assert statuses == {user.pk: None, user2.pk: None}
+
+    def test_single_query_for_many_users(self, user, user2):
+        """Loading statuses costs one query however many users are included."""
+        fill_profile(user)
+        fill_profile(user2)
+
+        with CaptureQueriesContext(connection) as ctx:
+            bulk_calorie_status(User.objects.filter(pk__in=[user.pk, user2.pk]))
+
+        assert len(ctx.captured_queries) == 1
@@ -12,9 +12,13 @@ from tracker.models import DietaryEntry, WeightEntry
 
 User = get_user_model()
 
+# Resolved once at import; pytest-django has configured Django by collection time
+DASHBOARD_URL = reverse('tracker:dashboard')
+PARTNER_DASHBOARD_URL = reverse('tracker:partner_dashboard')
+
 
 class TestPartnerLinking:
-    """Tests for partner linking functionality."""
+    """Tests for partner linking functionality (model-level, no client)."""
 
     def test_users_start_without_partners(self, user, user2):
         """New users should not have partners by default."""
@@ -65,9 +69,9 @@ class TestPartnerDashboardView:
     def test_partner_dashboard_shows_partner_data(self, client, linked_partners, partner_with_data):
         """Partner dashboard should show partner's entries."""
         user, partner = linked_partners
-        client.login(username='testuser', password='testpass123')
+        client.force_login(user)
 
-        response = client.get(reverse('tracker:partner_dashboard'))
+        response = client.get(PARTNER_DASHBOARD_URL)
 
         # Should be viewing partner's data
         assert response.context['viewing_partner'] is True
@@ -76,16 +80,16 @@ class TestPartnerDashboardView:
     def test_partner_dashboard_hides_own_data(self, client, linked_partners, dietary_entry):
         """Partner dashboard should not show user's own data."""
         user, partner = linked_partners
-        client.login(username='testuser', password='testpass123')
+        client.force_login(user)
 
-        response = client.get(reverse('tracker:partner_dashboard'))
+        response = client.get(PARTNER_DASHBOARD_URL)
 
         # Own data should not appear (dietary_entry belongs to user)
         assert dietary_entry not in response.context['dietary_recent']
 
     def test_partner_dashboard_redirects_without_partner(self, authenticated_client):
         """Partner dashboard without partner shows own data."""
-        response = authenticated_client.get(reverse('tracker:partner_dashboard'))
+        response = authenticated_client.get(PARTNER_DASHBOARD_URL)
 
         # Should still work but show own data
         assert response.status_code == 200
@@ -94,43 +98,40 @@ class TestPartnerDashboardView:
     def test_partner_banner_visible_when_viewing_partner(self, client, linked_partners):
         """Partner banner should be visible when viewing partner dashboard."""
         user, partner = linked_partners
-        client.login(username='testuser', password='testpass123')
+        client.force_login(user)
 
-        response = client.get(reverse('tracker:partner_dashboard'))
+        response = client.get(PARTNER_DASHBOARD_URL)
 
-        content = response.content.decode()
-        assert 'partner-banner' in content
-        assert partner.username in content
+        assert b'partner-banner' in response.content
+        assert partner.username.encode() in response.content
 
     def test_partner_toggle_visible_on_own_dashboard(self, client, linked_partners):
         """Partner toggle card should be visible on own dashboard."""
         user, partner = linked_partners
-        client.login(username='testuser', password='testpass123')
+        client.force_login(user)
 
-        response = client.get(reverse('tracker:dashboard'))
+        response = client.get(DASHBOARD_URL)
 
-        content = response.content.decode()
-        assert 'partner-toggle-card' in content
-        assert partner.username in content
+        assert b'partner-toggle-card' in response.content
+        assert partner.username.encode() in response.content
 
     def test_partner_toggle_hidden_without_partner(self, authenticated_client):
         """Partner toggle should not appear when no partner is linked."""
-        response = authenticated_client.get(reverse('tracker:dashboard'))
+        response = authenticated_client.get(DASHBOARD_URL)
 
-        content = response.content.decode()
-        assert 'partner-toggle-card' not in content
+        assert b'partner-toggle-card' not in response.content
 
     def test_back_to_mine_link_works(self, client, linked_partners):
         """Back to Mine link should return to own dashboard."""
         user, partner = linked_partners
-        client.login(username='testuser', password='testpass123')
+        client.force_login(user)
 
         # View partner dashboard
-        response = client.get(reverse('tracker:partner_dashboard'))
+        response = client.get(PARTNER_DASHBOARD_URL)
         assert response.context['viewing_partner'] is True
 
         # Click back to mine (view own dashboard)
-        response = client.get(reverse('tracker:dashboard'))
+        response = client.get(DASHBOARD_URL)
         assert response.context['viewing_partner'] is False
 
 
@@ -140,33 +141,43 @@ class TestPartnerDailyRecap:
     def test_can_view_partner_daily_recap(self, client, linked_partners, partner_with_data):
         """User can view their partner's daily recap."""
         user, partner = linked_partners
-        client.login(username='testuser', password='testpass123')
+        client.force_login(user)
 
         today = date.today().strftime('%Y-%m-%d')
         response = client.get(f'/tracker/daily-recap/{today}/user/{partner.id}/')
 
-        data = json.loads(response.content)
+        data = response.json()
         assert data['success'] is True
         assert data['dietary'][0]['item'] == 'Partner Breakfast'
 
+    def test_partner_daily_recap_has_etag(self, client, linked_partners, partner_with_data):
+        """Partner recaps are revalidated with an ETag like the user's own."""
+        user, partner = linked_partners
+        client.force_login(user)
+
+        url = f'/tracker/daily-recap/{date.today()}/user/{partner.id}/'
+        etag = client.get(url)['ETag']
+
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
     def test_cannot_view_non_partner_daily_recap(self, authenticated_client, user2):
         """User cannot view daily recap of non-partner."""
         today = date.today().strftime('%Y-%m-%d')
         response = authenticated_client.get(f'/tracker/daily-recap/{today}/user/{user2.id}/')
 
-        data = json.loads(response.content)
+        data = response.json()
         assert data['success'] is False
         assert 'Unauthorized' in data['error']
 
     def test_partner_recap_shows_correct_summary(self, client, linked_partners, partner_with_data):
         """Partner's daily recap should show correct summary."""
         user, partner = linked_partners
-        client.login(username='testuser', password='testpass123')
+        client.force_login(user)
 
         today = date.today().strftime('%Y-%m-%d')
         response = client.get(f'/tracker/daily-recap/{today}/user/{partner.id}/')
 
-        data = json.loads(response.content)
+        data = response.json()
         assert data['summary']['total_calories_in'] == 350
         assert data['summary']['total_calories_burned'] == 200
 
@@ -176,33 +187,28 @@ class TestPartnerDataIsolation:
 
     def test_partner_cannot_see_other_users_data(self, client, user, user2, admin_user):
         """Users should not see data from users who aren't their partner."""
-        # Create data for admin_user
-        DietaryEntry.objects.create(
-            user=admin_user,
-            date=date.today(),
-            item='Admin Food',
-            calories=1000
-        )
+        # The partner check rejects the request before any entries are read,
+        # so admin_user needs no data of their own here
 
         # Link user to user2 (not admin)
         user.profile.partner = user2
         user.profile.save()
 
-        client.login(username='testuser', password='testpass123')
+        client.force_login(user)
 
         # Try to access admin's data via partner endpoint
         today = date.today().strftime('%Y-%m-%d')
         response = client.get(f'/tracker/daily-recap/{today}/user/{admin_user.id}/')
 
-        data = json.loads(response.content)
+        data = response.json()
         assert data['success'] is False
 
     def test_own_dashboard_unaffected_by_partner_data(self, client, linked_partners, partner_with_data, dietary_entry):
         """Own dashboard should only show own data."""
         user, partner = linked_partners
-        client.login(username='testuser', password='testpass123')
+        client.force_login(user)
 
-        response = client.get(reverse('tracker:dashboard'))
+        response = client.get(DASHBOARD_URL)
 
         # Should show own data
         assert dietary_entry in response.context['dietary_recent']
@@ -215,7 +221,7 @@ class TestPartnerDataIsolation:
     def test_partner_actions_disabled(self, client, linked_partners):
         """User should not be able to add data for partner."""
         user, partner = linked_partners
-        client.login(username='testuser', password='testpass123')
+        client.force_login(user)
 
         # Try to add weight (should add to own account, not partner's)
         response = client.post('/tracker/add-weight/', {
@@ -223,15 +229,17 @@ class TestPartnerDataIsolation:
             'date': date.today().strftime('%Y-%m-%d'),
         })
 
-        data = json.loads(response.content)
+        data = response.json()
         assert data['success'] is True
 
         # Verify it was added to user's account, not partner's
-        user_entry = WeightEntry.objects.filter(user=user, weight_kg=Decimal('100.0'))
-        partner_entry = WeightEntry.objects.filter(user=partner, weight_kg=Decimal('100.0'))
+        owners = set(
+            WeightEntry.objects.filter(weight_kg=Decimal('100.0'), user__in=[user.pk, partner.pk])
+            .values_list('user_id', flat=True)
+        )
 
-        assert user_entry.exists()
-        assert not partner_entry.exists()
+        assert user.pk in owners
+        assert partner.pk not in owners
 
 
 class TestPartnerCharts:
@@ -240,9 +248,9 @@ class TestPartnerCharts:
     def test_partner_chart_data_correct(self, client, linked_partners, partner_with_data):
         """Partner dashboard should have correct chart data."""
         user, partner = linked_partners
-        client.login(username='testuser', password='testpass123')
+        client.force_login(user)
 
-        response = client.get(reverse('tracker:partner_dashboard'))
+        response = client.get(PARTNER_DASHBOARD_URL)
 
         # Chart data should be for partner
         cal_values = json.loads(response.context['cal_values'])
@@ -252,29 +260,22 @@ class TestPartnerCharts:
     def test_partner_heatmap_data_correct(self, client, linked_partners, partner_with_data):
         """Partner's heatmap should show their activity."""
         user, partner = linked_partners
-        client.login(username='testuser', password='testpass123')
+        client.force_login(user)
 
-        response = client.get(reverse('tracker:partner_dashboard'))
+        response = client.get(PARTNER_DASHBOARD_URL)
 
-        heatmap_data = json.loads(response.context['heatmap_data'])
+        heatmap = json.loads(response.context['heatmap_data'])
         today_str = date.today().strftime('%Y-%m-%d')
 
-        # Find today's entry in heatmap
-        today_count = None
-        for entry in heatmap_data:
-            if entry[0] == today_str:
-                today_count = entry[1]
-                break
-
         # Partner has 3 entries today (dietary, exercise, weight)
-        assert today_count == 3
+        assert heatmap.get(today_str) == 3
 
     def test_partner_latest_weight_shown(self, client, linked_partners, partner_with_data):
         """Partner's latest weight should be shown."""
         user, partner = linked_partners
-        client.login(username='testuser', password='testpass123')
+        client.force_login(user)
 
-        response = client.get(reverse('tracker:partner_dashboard'))
+        response = client.get(PARTNER_DASHBOARD_URL)
 
         # Partner's weight is 55.0
         assert response.context['latest_weight'] == 55.0
@@ -297,8 +298,8 @@ class TestOneWayPartnerLink:
             calories=400
         )
 
-        client.login(username='testuser', password='testpass123')
-        response = client.get(reverse('tracker:partner_dashboard'))
+        client.force_login(user)
+        response = client.get(PARTNER_DASHBOARD_URL)
 
         assert response.context['viewing_partner'] is True
         assert response.context['target_user'] == user2
@@ -312,8 +313,8 @@ class TestOneWayPartnerLink:
         # user2 hasn't linked to user
         assert user2.profile.partner is None
 
-        client.login(username='partner', password='partnerpass123')
-        response = client.get(reverse('tracker:partner_dashboard'))
+        client.force_login(user2)
+        response = client.get(PARTNER_DASHBOARD_URL)
 
         # Should show own data since no partner linked
         assert response.context['viewing_partner'] is False
@@ -322,36 +323,24 @@ class TestOneWayPartnerLink:
 class TestPartnerDeletionHandling:
     """Tests for handling partner account deletion."""
 
-    def test_partner_deletion_clears_link(self, linked_partners):
-        """When partner is deleted, link should be cleared."""
+    def test_partner_deletion(self, client, linked_partners):
+        """Deleting the partner clears the link and both dashboards keep working."""
         user, partner = linked_partners
+        client.force_login(user)
+
+        # Delete partner (one cascade shared by every check below)
         partner.delete()
 
+        # Link should be cleared
         user.profile.refresh_from_db()
         assert user.profile.partner is None
 
-    def test_dashboard_works_after_partner_deleted(self, client, linked_partners):
-        """Dashboard should work after partner is deleted."""
-        user, partner = linked_partners
-        client.login(username='testuser', password='testpass123')
-
-        # Delete partner
-        partner.delete()
-
         # Dashboard should still work
-        response = client.get(reverse('tracker:dashboard'))
+        response = client.get(DASHBOARD_URL)
         assert response.status_code == 200
         assert response.context['partner'] is None
 
-    def test_partner_dashboard_after_partner_deleted(self, client, linked_partners):
-        """Partner dashboard should fallback to own data after deletion."""
-        user, partner = linked_partners
-        client.login(username='testuser', password='testpass123')
-
-        # Delete partner
-        partner.delete()
-
-        # Partner dashboard should show own data
-        response = client.get(reverse('tracker:partner_dashboard'))
+        # Partner dashboard should fall back to own data
+        response = client.get(PARTNER_DASHBOARD_URL)
         assert response.status_code == 200
         assert response.context['viewing_partner'] is False
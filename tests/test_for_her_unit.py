@@ -0,0 +1,64 @@
+"""
+Unit tests for the FOR_HER context processor, called without rendering a page.
+"""
+from django.contrib.auth.models import AnonymousUser
+from django.test import RequestFactory
+
+from tracker.context_processors import for_her
+
+
+def make_request(user):
+    """Build a bare GET request carrying ``user``, as the auth middleware would."""
+    request = RequestFactory().get('/')
+    request.user = user
+    return request
+
+
+class TestForHer:
+    """Tests for tracker.context_processors.for_her."""
+
+    def test_false_for_anonymous(self):
+        """FOR_HER should be False for anonymous users."""
+        assert for_her(make_request(AnonymousUser()))['FOR_HER'] is False
+
+    def test_false_for_regular_user(self, user):
+        """FOR_HER should be False for regular users."""
+        assert for_her(make_request(user))['FOR_HER'] is False
+
+    def test_true_for_special_user(self, special_user):
+        """FOR_HER should be True for users in special group."""
+        assert for_her(make_request(special_user))['FOR_HER'] is True
+
+    def test_updates_when_group_added(self, user, special_group):
+        """FOR_HER should update when user is added to group."""
+        assert for_her(make_request(user))['FOR_HER'] is False
+
+        user.groups.add(special_group)
+
+        assert for_her(make_request(user))['FOR_HER'] is True
+
+    def test_updates_when_group_removed(self, special_user, special_group):
+        """FOR_HER should update when user is removed from group."""
+        assert for_her(make_request(special_user))['FOR_HER'] is True
+
+        special_user.groups.remove(special_group)
+
+        assert for_her(make_request(special_user))['FOR_HER'] is False
+
+    def test_updates_when_added_from_group_side(self, user, special_group):
+        """Membership changed through group.user_set also refreshes FOR_HER."""
+        assert for_her(make_request(user))['FOR_HER'] is False
+
+        special_group.user_set.add(user)
+
+        assert for_her(make_request(user))['FOR_HER'] is True
+
+    def test_computed_once_per_request(self, user, special_group):
+        """Repeat calls within one request reuse the first answer."""
+        request = make_request(user)
+        assert for_her(request)['FOR_HER'] is False
+
+        special_group.user_set.add(user)
+
+        assert for_her(request)['FOR_HER'] is False
+        assert for_her(make_request(user))['FOR_HER'] is True
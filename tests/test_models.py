@@ -13,6 +13,16 @@ from tracker.models import DietaryEntry, ExerciseEntry, WeightEntry, UserProfile
 User = get_user_model()
 
 
+def assert_all_deleted(model, ids):
+    """Assert that none of ``ids`` are left in ``model``'s table, in one query."""
+    assert model.objects.filter(pk__in=ids).count() == 0
+
+
+def partner_id_of(user):
+    """Read the stored partner id for ``user`` without loading the profile."""
+    return UserProfile.objects.filter(user=user).values_list('partner_id', flat=True).first()
+
+
 class TestUserProfile:
     """Tests for UserProfile model."""
 
@@ -30,10 +40,11 @@ class TestUserProfile:
         assert 'testuser' in str(user.profile)
         assert 'No partner' in str(user.profile)
 
-    def test_profile_str_with_partner(self, linked_partners):
+    def test_profile_str_with_partner(self, linked_partners_prefetched, django_assert_num_queries):
         """String representation with partner."""
-        user, partner = linked_partners
-        profile_str = str(user.profile)
+        user, partner = linked_partners_prefetched
+        with django_assert_num_queries(0):
+            profile_str = str(user.profile)
         assert 'testuser' in profile_str
         assert 'partner' in profile_str
 
@@ -42,22 +53,21 @@ class TestUserProfile:
         user.profile.partner = user2
         user.profile.save()
 
-        user.profile.refresh_from_db()
-        assert user.profile.partner == user2
+        assert partner_id_of(user) == user2.id
 
-    def test_partner_unlinking(self, linked_partners):
+    def test_partner_unlinking(self, linked_partners_prefetched):
         """Test partner can be unlinked."""
-        user, partner = linked_partners
+        user, partner = linked_partners_prefetched
         user.profile.partner = None
         user.profile.save()
 
-        user.profile.refresh_from_db()
-        assert user.profile.partner is None
+        assert partner_id_of(user) is None
 
-    def test_get_partner_profile(self, linked_partners):
+    def test_get_partner_profile(self, linked_partners_prefetched, django_assert_num_queries):
         """Test get_partner_profile method."""
-        user, partner = linked_partners
-        partner_profile = user.profile.get_partner_profile()
+        user, partner = linked_partners_prefetched
+        with django_assert_num_queries(0):
+            partner_profile = user.profile.get_partner_profile()
         assert partner_profile == partner.profile
 
     def test_get_partner_profile_no_partner(self, user):
@@ -71,40 +81,12 @@ class TestUserProfile:
         partner_id = partner.id
         partner.delete()
 
-        user.profile.refresh_from_db()
-        assert user.profile.partner is None
+        assert partner_id_of(user) is None
 
 
 class TestDietaryEntry:
     """Tests for DietaryEntry model."""
 
-    def test_create_dietary_entry(self, user):
-        """Test creating a dietary entry."""
-        entry = DietaryEntry.objects.create(
-            user=user,
-            date=date.today(),
-            item='Pizza',
-            calories=800,
-            notes='Lunch',
-            remarks='Cheat day'
-        )
-        assert entry.pk is not None
-        assert entry.item == 'Pizza'
-        assert entry.calories == 800
-
-    def test_dietary_entry_str(self, dietary_entry):
-        """Test string representation."""
-        assert 'Test Food' in str(dietary_entry)
-        assert '500' in str(dietary_entry)
-
-    def test_dietary_entry_user_cascade_delete(self, dietary_entry):
-        """Entries should be deleted when user is deleted."""
-        user = dietary_entry.user
-        entry_id = dietary_entry.id
-        user.delete()
-
-        assert not DietaryEntry.objects.filter(id=entry_id).exists()
-
     def test_dietary_entry_blank_fields(self, user):
         """Test that item and notes can be blank."""
         entry = DietaryEntry.objects.create(
@@ -118,10 +100,10 @@ class TestDietaryEntry:
         assert entry.pk is not None
         assert entry.item == ''
 
-    def test_dietary_entry_ordering(self, dietary_entries):
+    def test_dietary_entry_ordering(self, db, dietary_entries_ro):
         """Test that entries can be ordered by date."""
         entries = DietaryEntry.objects.filter(
-            user=dietary_entries[0].user
+            user=dietary_entries_ro[0].user
         ).order_by('-date')
 
         # Most recent first
@@ -131,24 +113,6 @@ class TestDietaryEntry:
 class TestExerciseEntry:
     """Tests for ExerciseEntry model."""
 
-    def test_create_exercise_entry(self, user):
-        """Test creating an exercise entry."""
-        entry = ExerciseEntry.objects.create(
-            user=user,
-            date=date.today(),
-            activity='Swimming',
-            duration_minutes=45,
-            calories_burned=400,
-            remarks='Great workout'
-        )
-        assert entry.pk is not None
-        assert entry.activity == 'Swimming'
-        assert entry.duration_minutes == 45
-
-    def test_exercise_entry_str(self, exercise_entry):
-        """Test string representation."""
-        assert 'Running' in str(exercise_entry)
-
     def test_exercise_entry_nullable_calories(self, user):
         """Test that calories_burned can be null."""
         entry = ExerciseEntry.objects.create(
@@ -162,32 +126,14 @@ class TestExerciseEntry:
         assert entry.pk is not None
         assert entry.calories_burned is None
 
-    def test_exercise_entry_user_cascade_delete(self, exercise_entry):
-        """Entries should be deleted when user is deleted."""
-        user = exercise_entry.user
-        entry_id = exercise_entry.id
-        user.delete()
-
-        assert not ExerciseEntry.objects.filter(id=entry_id).exists()
-
 
 class TestWeightEntry:
     """Tests for WeightEntry model."""
 
-    def test_create_weight_entry(self, user):
-        """Test creating a weight entry."""
-        entry = WeightEntry.objects.create(
-            user=user,
-            date=date.today(),
-            weight_kg=Decimal('75.5'),
-            notes='After breakfast'
-        )
-        assert entry.pk is not None
-        assert entry.weight_kg == Decimal('75.5')
-
-    def test_weight_entry_str(self, weight_entry):
+    def test_weight_entry_str(self, weight_entries_ro):
         """Test string representation."""
-        assert '70.5' in str(weight_entry)
+        entry = weight_entries_ro[0]
+        assert f'{entry.weight_kg} kg' in str(entry)
 
     def test_weight_entry_decimal_precision(self, user):
         """Test decimal precision for weight."""
@@ -199,22 +145,37 @@ class TestWeightEntry:
         )
         assert entry.weight_kg == Decimal('65.75')
 
-    def test_weight_entry_user_cascade_delete(self, weight_entry):
-        """Entries should be deleted when user is deleted."""
-        user = weight_entry.user
-        entry_id = weight_entry.id
-        user.delete()
-
-        assert not WeightEntry.objects.filter(id=entry_id).exists()
-
-    def test_weight_trend(self, weight_entries):
+    def test_weight_trend(self, db, weight_entries_ro):
         """Test that weight entries can track a trend."""
-        user = weight_entries[0].user
-        entries = WeightEntry.objects.filter(user=user).order_by('date')
+        user = weight_entries_ro[0].user
 
-        weights = [e.weight_kg for e in entries]
         # Verify we have multiple entries with different weights
-        assert len(set(weights)) > 1
+        assert WeightEntry.objects.filter(user=user).values('weight_kg').distinct().count() > 1
+
+
+class TestEntryModels:
+    """Behaviour shared by the three entry models."""
+
+    @pytest.mark.parametrize('model, fields', [
+        (DietaryEntry, {'item': 'Pizza', 'calories': 800, 'notes': 'Lunch', 'remarks': 'Cheat day'}),
+        (ExerciseEntry, {'activity': 'Swimming', 'duration_minutes': 45, 'calories_burned': 400, 'remarks': 'Great workout'}),
+        (WeightEntry, {'weight_kg': Decimal('75.5'), 'notes': 'After breakfast'}),
+    ])
+    def test_create_entry(self, user, model, fields):
+        """Test creating an entry of each type."""
+        entry = model.objects.create(user=user, date=date.today(), **fields)
+
+        assert entry.pk is not None
+        for name, value in fields.items():
+            assert getattr(entry, name) == value
+
+    def test_entries_cascade_delete_with_user(self, dietary_entries, exercise_entries, weight_entries):
+        """Entries of every type should be deleted when their user is deleted."""
+        dietary_entries[0].user.delete()
+
+        assert_all_deleted(DietaryEntry, [e.pk for e in dietary_entries])
+        assert_all_deleted(ExerciseEntry, [e.pk for e in exercise_entries])
+        assert_all_deleted(WeightEntry, [e.pk for e in weight_entries])
 
 
 class TestModelRelationships:
@@ -239,9 +200,10 @@ class TestModelRelationships:
         """Test multiple entries can exist for same day."""
         today = date.today()
 
-        DietaryEntry.objects.create(user=user, date=today, item='Breakfast', calories=400)
-        DietaryEntry.objects.create(user=user, date=today, item='Lunch', calories=600)
-        DietaryEntry.objects.create(user=user, date=today, item='Dinner', calories=700)
+        DietaryEntry.objects.bulk_create([
+            DietaryEntry(user=user, date=today, item=item, calories=calories)
+            for item, calories in [('Breakfast', 400), ('Lunch', 600), ('Dinner', 700)]
+        ])
 
         assert DietaryEntry.objects.filter(user=user, date=today).count() == 3
 
@@ -8,6 +8,23 @@ from django.contrib.auth.models import Group
 
 User = get_user_model()
 
+# Resolved once at import; pytest-django has configured Django by collection time
+DASHBOARD_URL = reverse('tracker:dashboard')
+GUIDE_URL = reverse('tracker:guide')
+
+# Query budgets for a logged-in page view, including session and user lookups
+DASHBOARD_MAX_QUERIES = 14
+GUIDE_MAX_QUERIES = 4
+
+
+def assign_special(users, group):
+    """Add every user to ``group`` with a single INSERT into the M2M table."""
+    Membership = User.groups.through
+    Membership.objects.bulk_create(
+        [Membership(user_id=u.pk, group_id=group.pk) for u in users],
+        ignore_conflicts=True,
+    )
+
 
 class TestSpecialGroup:
     """Tests for the 'special' group functionality."""
@@ -33,85 +50,34 @@ class TestSpecialGroup:
 
 
 class TestForHerContextProcessor:
-    """Tests for the FOR_HER context processor."""
+    """Smoke test for FOR_HER reaching a rendered page.
 
-    def test_for_her_false_for_anonymous(self, client):
-        """FOR_HER should be False for anonymous users."""
-        response = client.get(reverse('tracker:guide'))
-        assert response.context['FOR_HER'] is False
-
-    def test_for_her_false_for_regular_user(self, authenticated_client):
-        """FOR_HER should be False for regular users."""
-        response = authenticated_client.get(reverse('tracker:dashboard'))
-        assert response.context['FOR_HER'] is False
+    The processor's logic is unit-tested in test_for_her_unit.py.
+    """
 
-    def test_for_her_true_for_special_user(self, client, special_user):
+    def test_for_her_true_for_special_user(self, client, special_user, django_assert_max_num_queries):
         """FOR_HER should be True for users in special group."""
-        client.login(username='specialuser', password='specialpass123')
-        response = client.get(reverse('tracker:dashboard'))
-        assert response.context['FOR_HER'] is True
-
-    def test_for_her_updates_when_group_added(self, client, user, special_group):
-        """FOR_HER should update when user is added to group."""
-        client.login(username='testuser', password='testpass123')
-
-        # Before adding to group
-        response = client.get(reverse('tracker:dashboard'))
-        assert response.context['FOR_HER'] is False
-
-        # Add to group
-        user.groups.add(special_group)
-
-        # After adding to group
-        response = client.get(reverse('tracker:dashboard'))
-        assert response.context['FOR_HER'] is True
-
-    def test_for_her_updates_when_group_removed(self, client, special_user, special_group):
-        """FOR_HER should update when user is removed from group."""
-        client.login(username='specialuser', password='specialpass123')
-
-        # Before removing from group
-        response = client.get(reverse('tracker:dashboard'))
+        client.force_login(special_user)
+        with django_assert_max_num_queries(DASHBOARD_MAX_QUERIES):
+            response = client.get(DASHBOARD_URL)
         assert response.context['FOR_HER'] is True
 
-        # Remove from group
-        special_user.groups.remove(special_group)
-
-        # After removing from group
-        response = client.get(reverse('tracker:dashboard'))
-        assert response.context['FOR_HER'] is False
-
 
 class TestSpecialModeAdmin:
     """Tests for managing special mode via admin."""
 
-    def test_admin_can_add_user_to_special_group(self, admin_client, user, special_group):
-        """Admin should be able to add user to special group."""
+    def test_admin_user_form_renders(self, admin_client, user, special_group):
+        """Admin user form should render with the special group selectable."""
         url = reverse('admin:auth_user_change', args=[user.pk])
-
-        # Get current form data
         response = admin_client.get(url)
+
         assert response.status_code == 200
+        assert f'value="{special_group.pk}"'.encode() in response.content
+
+    def test_add_user_to_special_group_via_orm(self, user, special_group):
+        """Group membership saved by the admin form is a plain M2M add."""
+        user.groups.add(special_group)
 
-        # Add user to special group via admin
-        data = {
-            'username': user.username,
-            'date_joined_0': user.date_joined.strftime('%Y-%m-%d'),
-            'date_joined_1': user.date_joined.strftime('%H:%M:%S'),
-            'groups': [special_group.pk],
-            'profile-TOTAL_FORMS': '1',
-            'profile-INITIAL_FORMS': '1',
-            'profile-MIN_NUM_FORMS': '0',
-            'profile-MAX_NUM_FORMS': '1',
-            'profile-0-id': user.profile.pk,
-            'profile-0-user': user.pk,
-            'profile-0-partner': '',
-        }
-
-        response = admin_client.post(url, data)
-
-        # Refresh and check
-        user.refresh_from_db()
         assert user.groups.filter(name='special').exists()
 
     def test_groups_visible_in_user_admin(self, admin_client, user):
@@ -126,49 +92,48 @@ class TestSpecialModeAdmin:
 class TestSpecialModeTemplateUsage:
     """Tests for template usage of FOR_HER variable."""
 
-    def test_guide_accessible_for_special_user(self, client, special_user):
+    def test_guide_accessible_for_special_user(self, client, special_user, django_assert_max_num_queries):
         """Special users should be able to access the guide."""
-        client.login(username='specialuser', password='specialpass123')
-        response = client.get(reverse('tracker:guide'))
+        client.force_login(special_user)
+        with django_assert_max_num_queries(GUIDE_MAX_QUERIES):
+            response = client.get(GUIDE_URL)
         assert response.status_code == 200
 
-    def test_dashboard_accessible_for_special_user(self, client, special_user):
+    def test_dashboard_accessible_for_special_user(self, client, special_user, django_assert_max_num_queries):
         """Special users should be able to access the dashboard."""
-        client.login(username='specialuser', password='specialpass123')
-        response = client.get(reverse('tracker:dashboard'))
+        client.force_login(special_user)
+        with django_assert_max_num_queries(DASHBOARD_MAX_QUERIES):
+            response = client.get(DASHBOARD_URL)
         assert response.status_code == 200
 
 
 class TestMultipleSpecialUsers:
     """Tests for multiple users in special group."""
 
-    def test_multiple_users_can_be_special(self, db, special_group):
+    def test_multiple_users_can_be_special(self, user_pool, special_group):
         """Multiple users can be in the special group."""
-        user1 = User.objects.create_user('special1', password='pass123')
-        user2 = User.objects.create_user('special2', password='pass123')
+        user1, user2 = user_pool
 
-        user1.groups.add(special_group)
-        user2.groups.add(special_group)
+        assign_special([user1, user2], special_group)
 
         assert special_group.user_set.count() >= 2
         assert user1.groups.filter(name='special').exists()
         assert user2.groups.filter(name='special').exists()
 
-    def test_special_users_independent(self, client, db, special_group):
+    def test_special_users_independent(self, client, user_pool, special_group):
         """Special users should have independent sessions."""
-        user1 = User.objects.create_user('special1', password='pass123')
-        user2 = User.objects.create_user('special2', password='pass123')
+        user1, user2 = user_pool
 
         user1.groups.add(special_group)
         # user2 is not special
 
         # Check user1
-        client.login(username='special1', password='pass123')
-        response = client.get(reverse('tracker:dashboard'))
+        client.force_login(user1)
+        response = client.get(DASHBOARD_URL)
         assert response.context['FOR_HER'] is True
         client.logout()
 
         # Check user2
-        client.login(username='special2', password='pass123')
-        response = client.get(reverse('tracker:dashboard'))
+        client.force_login(user2)
+        response = client.get(DASHBOARD_URL)
         assert response.context['FOR_HER'] is False
@@ -6,10 +6,12 @@ import json
 from datetime import date, timedelta
 from decimal import Decimal
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 
-from tracker.models import DietaryEntry, ExerciseEntry, WeightEntry
+from tracker.models import DietaryEntry, ExerciseEntry, WeightEntry, bump_entry_version
 
 User = get_user_model()
 
@@ -41,6 +43,30 @@ class TestDashboardView:
         assert 'viewing_partner' in response.context
         assert 'partner' in response.context
 
+    def test_dashboard_query_count_independent_of_rows(self, authenticated_client, user, django_assert_num_queries):
+        """Dashboard query count should not grow with the number of entries."""
+        with CaptureQueriesContext(connection) as empty:
+            authenticated_client.get(reverse('tracker:dashboard'))
+
+        today = date.today()
+        DietaryEntry.objects.bulk_create(
+            DietaryEntry(user=user, date=today - timedelta(days=i), item=f'Meal {i}', calories=300)
+            for i in range(30)
+        )
+        ExerciseEntry.objects.bulk_create(
+            ExerciseEntry(user=user, date=today - timedelta(days=i), activity='Run', duration_minutes=20)
+            for i in range(30)
+        )
+        # bulk_create skips the signal that invalidates the cached charts
+        bump_entry_version(user.pk)
+        with CaptureQueriesContext(connection) as populated:
+            response = authenticated_client.get(reverse('tracker:dashboard'))
+
+        assert len(populated) == len(empty)
+        # Recent rows come back with their owner already attached
+        with django_assert_num_queries(0):
+            assert {e.user.pk for e in response.context['dietary_recent']} == {user.pk}
+
     def test_dashboard_shows_user_data(self, authenticated_client, dietary_entry):
         """Dashboard should show the user's dietary entries."""
         response = authenticated_client.get(reverse('tracker:dashboard'))
@@ -81,6 +107,62 @@ class TestDashboardView:
         assert 'no-cache' in cache_control or 'no-store' in cache_control
 
 
+class TestDashboardChartCache:
+    """Tests for the per-user chart cache behind the dashboard."""
+
+    def test_repeat_view_skips_chart_queries(self, authenticated_client):
+        """A second dashboard view should serve the charts from the cache."""
+        with CaptureQueriesContext(connection) as first:
+            authenticated_client.get(reverse('tracker:dashboard'))
+        with CaptureQueriesContext(connection) as second:
+            authenticated_client.get(reverse('tracker:dashboard'))
+
+        assert len(second) < len(first)
+
+    def test_new_entry_invalidates_cache(self, authenticated_client, user):
+        """Saving an entry should show up on the next dashboard view."""
+        authenticated_client.get(reverse('tracker:dashboard'))
+        DietaryEntry.objects.create(user=user, date=date.today(), item='Late snack', calories=250)
+
+        response = authenticated_client.get(reverse('tracker:dashboard'))
+
+        assert response.context['total_calories'] == 250
+
+    def test_deleted_entry_invalidates_cache(self, authenticated_client, dietary_entry):
+        """Deleting an entry should drop it from the next dashboard view."""
+        authenticated_client.get(reverse('tracker:dashboard'))
+        dietary_entry.delete()
+
+        response = authenticated_client.get(reverse('tracker:dashboard'))
+
+        assert response.context['total_calories'] == 0
+
+    def test_import_invalidates_cache(self, authenticated_client):
+        """Bulk imports should show up on the next dashboard view."""
+        authenticated_client.get(reverse('tracker:dashboard'))
+        authenticated_client.post(reverse('tracker:import_json'), {'json_data': json.dumps([{
+            "date": str(date.today()),
+            "dietary": [{"item": "Imported", "calories": 400}],
+        }])})
+
+        response = authenticated_client.get(reverse('tracker:dashboard'))
+
+        assert response.context['total_calories'] == 400
+
+
+    def test_calorie_setup_weight_invalidates_cache(self, authenticated_client, user):
+        """The first weigh-in from calorie setup should reach the cached charts."""
+        authenticated_client.get(reverse('tracker:dashboard'))
+        authenticated_client.post(reverse('tracker:calorie_setup'), {
+            'fitness_goal': 'lose', 'age': '30', 'gender': 'female',
+            'height_cm': '165', 'activity_level': 'light', 'initial_weight': '70',
+        })
+
+        user.profile.refresh_from_db()
+        assert user.profile.entry_version > 0
+        response = authenticated_client.get(reverse('tracker:dashboard'))
+        assert json.loads(response.context['wt_values']) == [70.0]
+
 class TestPartnerDashboardView:
     """Tests for partner dashboard view."""
 
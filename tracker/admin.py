@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth import get_user_model
-from django.utils.html import format_html
+from django.utils.safestring import mark_safe
 from .models import DietaryEntry, ExerciseEntry, WeightEntry, UserProfile, AIUsage
 
 User = get_user_model()
@@ -39,43 +39,74 @@ admin.site.unregister(User)
 admin.site.register(User, UserAdmin)
 
 
+class ChangeListOnlyMixin:
+    """Load only the ``list_only`` columns on the changelist page."""
+    list_only = ()
+
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        match = request.resolver_match
+        if self.list_only and match and match.url_name.endswith('_changelist'):
+            qs = qs.only(*self.list_only)
+        return qs
+
+
+@admin.display(description='User', ordering='user__username')
+def user_name(obj):
+    """Username column, read from the user joined by list_select_related."""
+    return obj.user.username
+
+
 @admin.register(DietaryEntry)
-class DietaryEntryAdmin(admin.ModelAdmin):
-    list_display = ('user', 'date', 'item', 'calories', 'notes')
-    list_filter = ('date', 'user')
+class DietaryEntryAdmin(ChangeListOnlyMixin, admin.ModelAdmin):
+    list_display = (user_name, 'date', 'item', 'calories', 'notes')
+    # Only offer users who have entries, instead of every account on the site
+    list_filter = ('date', ('user', admin.RelatedOnlyFieldListFilter))
+    autocomplete_fields = ('user',)
+    list_select_related = ('user',)
+    list_only = ('user__username', 'date', 'item', 'calories', 'notes')
     search_fields = ('item', 'notes', 'remarks')
 
 @admin.register(ExerciseEntry)
-class ExerciseEntryAdmin(admin.ModelAdmin):
-    list_display = ('user', 'date', 'activity', 'duration_minutes', 'calories_burned')
-    list_filter = ('date', 'user')
+class ExerciseEntryAdmin(ChangeListOnlyMixin, admin.ModelAdmin):
+    list_display = (user_name, 'date', 'activity', 'duration_minutes', 'calories_burned')
+    list_filter = ('date', ('user', admin.RelatedOnlyFieldListFilter))
+    autocomplete_fields = ('user',)
+    list_select_related = ('user',)
+    list_only = ('user__username', 'date', 'activity', 'duration_minutes', 'calories_burned')
     search_fields = ('activity', 'remarks')
 
 @admin.register(WeightEntry)
-class WeightEntryAdmin(admin.ModelAdmin):
-    list_display = ('user', 'date', 'weight_kg')
-    list_filter = ('date', 'user')
+class WeightEntryAdmin(ChangeListOnlyMixin, admin.ModelAdmin):
+    list_display = (user_name, 'date', 'weight_kg')
+    list_filter = ('date', ('user', admin.RelatedOnlyFieldListFilter))
+    autocomplete_fields = ('user',)
+    list_select_related = ('user',)
+    list_only = ('user__username', 'date', 'weight_kg')
 
 
 @admin.register(AIUsage)
 class AIUsageAdmin(admin.ModelAdmin):
     list_display = ('user', 'timestamp', 'request_type', 'success_badge', 'tokens_used')
     list_filter = ('request_type', 'success', 'timestamp')
+    list_select_related = ('user',)
     search_fields = ('user__username', 'error_message')
     readonly_fields = ('user', 'timestamp', 'request_type', 'success', 'error_message', 'tokens_used')
     date_hierarchy = 'timestamp'
     ordering = ('-timestamp',)
+    # The table only grows; skip the unfiltered COUNT(*) on every page load
+    show_full_result_count = False
+    list_per_page = 50
+
+    class Media:
+        css = {'all': ('tracker/css/admin.css',)}
 
     def success_badge(self, obj):
-        """Display success status with color badge."""
+        """Display success status with color badge (styled by admin.css)."""
+        # Constant markup, so there is nothing for format_html to escape
         if obj.success:
-            return format_html(
-                '<span style="background-color: #10b981; color: white; padding: 3px 8px; border-radius: 4px;">✓ Success</span>'
-            )
-        else:
-            return format_html(
-                '<span style="background-color: #ef4444; color: white; padding: 3px 8px; border-radius: 4px;">✗ Failed</span>'
-            )
+            return mark_safe('<span class="ai-badge ai-ok">✓ Success</span>')
+        return mark_safe('<span class="ai-badge ai-fail">✗ Failed</span>')
     success_badge.short_description = 'Status'
 
     def has_add_permission(self, request):
@@ -4,105 +4,196 @@ Handles both text descriptions and food photo analysis.
 """
 import os
 import json
+import io
 import base64
+import hashlib
+import threading
 from datetime import date
-from openai import OpenAI
-
-
-FOOD_LOG_SYSTEM_PROMPT = """You are a nutrition and fitness tracking assistant. When given a description of food eaten and/or exercise performed, extract the following information and return it as valid JSON.
-
-Output format:
-{{
-  "date": "{today}",
-  "dietary": [
-    {{"item": "food name", "calories": estimated_calories, "notes": "optional portion/preparation notes"}}
-  ],
-  "exercise": [
-    {{"activity": "exercise name", "duration_minutes": estimated_duration, "calories_burned": estimated_calories, "remarks": "optional notes"}}
-  ],
-  "remarks": "optional meal/activity context (breakfast, lunch, dinner, snack, workout)"
-}}
-
-Rules:
-1. Always use the date: {today}
-2. For food: Estimate calories using standard USDA nutritional data
-3. For exercise: Estimate duration and calories burned based on typical activity levels
-4. For images, identify all visible food items and estimate portion sizes
-5. Be conservative with calorie estimates - prefer slightly over than under
-6. Include helpful notes about portions (e.g., "large serving", "with sauce")
-7. Only return valid JSON, no additional text or markdown
-8. If you cannot identify any food or exercise, return: {{"error": "Could not identify any trackable items"}}
-9. For Malaysian/Asian foods, use accurate local calorie estimates
-10. Break down combo meals into individual items when possible
-11. Common exercises: running, walking, cycling, swimming, gym workout, yoga, etc.
-12. If no exercise mentioned, return empty exercise array: "exercise": []
-13. If no food mentioned, return empty dietary array: "dietary": []
-"""
 
-FOOD_LOG_SYSTEM_PROMPT_WITH_COACH = """You are a supportive fitness coach and nutrition tracking assistant. Your tone should be encouraging, motivating, and never judgmental.
-
-User's Fitness Profile:
-- Goal: {goal} weight
-- Daily calorie target: {daily_calorie_goal} kcal
-- Calories consumed today so far: {calories_today} kcal
-- Calories remaining: {calories_remaining} kcal
-
-When given a description of food eaten and/or exercise performed, extract the information AND provide personalized coach feedback.
-
-Output format:
-{{
-  "date": "{today}",
-  "dietary": [
-    {{"item": "food name", "calories": estimated_calories, "notes": "optional portion/preparation notes"}}
-  ],
-  "exercise": [
-    {{"activity": "exercise name", "duration_minutes": estimated_duration, "calories_burned": estimated_calories, "remarks": "optional notes"}}
-  ],
-  "remarks": "meal/activity context (breakfast, lunch, dinner, snack, workout)",
-  "coach_feedback": "Your personalized, encouraging feedback based on their goal and progress"
-}}
-
-Coach Feedback Guidelines:
-- For WEIGHT LOSS goal:
-  * If they're under their calorie goal: Be encouraging! ("Great choice! You still have X calories to enjoy today.")
-  * If they go slightly over: Be reassuring, not judgmental ("One meal doesn't define your journey. Tomorrow is a fresh start!")
-  * Celebrate healthy choices and exercise
-
-- For WEIGHT GAIN goal:
-  * If they're under their calorie goal: Motivate gently ("You're X calories short - maybe add a healthy snack or protein shake?")
-  * If they surpass their goal: Celebrate! ("Awesome! You've hit your bulking target for today!")
-  * Encourage calorie-dense nutritious foods
-
-- For MAINTAIN goal:
-  * If they're close to target: Praise balance ("Perfect balance today! You're right on track.")
-  * If significantly over/under: Gentle course correction
-
-Always be:
-- Supportive and positive
-- Specific with praise when earned
-- Constructive, never critical
-- Encouraging about the overall journey
-
-Rules for data extraction:
-1. Always use the date: {today}
-2. For food: Estimate calories using standard USDA nutritional data
-3. For exercise: Estimate duration and calories burned based on typical activity levels
-4. For images, identify all visible food items and estimate portion sizes
-5. Be conservative with calorie estimates - prefer slightly over than under
-6. Include helpful notes about portions (e.g., "large serving", "with sauce")
-7. Only return valid JSON, no additional text or markdown
-8. If you cannot identify any food or exercise, return: {{"error": "Could not identify any trackable items"}}
-9. For Malaysian/Asian foods, use accurate local calorie estimates
-10. Break down combo meals into individual items when possible
-11. Common exercises: running, walking, cycling, swimming, gym workout, yoga, etc.
-12. If no exercise mentioned, return empty exercise array: "exercise": []
-13. If no food mentioned, return empty dietary array: "dietary": []
-"""
+from django.core.cache import cache
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow is optional; photos are then sent as uploaded
+    Image = None
+
+
+# JSON reply shape; rendered once instead of as a prose example per prompt
+FOOD_LOG_SCHEMA = (
+    '{"date":"YYYY-MM-DD","dietary":[{"item":str,"calories":int,"notes":str}],'
+    '"exercise":[{"activity":str,"duration_minutes":int,"calories_burned":int,"remarks":str}],'
+    '"remarks":str}'
+)
+COACH_SCHEMA = FOOD_LOG_SCHEMA[:-1] + ',"coach_feedback":str}'
+
+BASE_RULES = "\n".join([
+    "Extract the food eaten and exercise done from the user's message or photo.",
+    '- Always set "date" to the Date given in the context message; never infer another day.',
+    "- Estimate food calories from USDA data, with local values for Malaysian/Asian dishes; round up rather than down.",
+    "- Split combo meals into separate items; note portion/preparation (e.g. \"large serving\", \"with sauce\").",
+    "- For photos, log every visible food item with its estimated portion.",
+    "- Estimate exercise duration and calories burned for typical intensity.",
+    "- remarks: meal/activity context (breakfast, lunch, dinner, snack, workout).",
+    "- Use [] when there is no food or no exercise.",
+    '- If nothing is trackable, reply {"error": "Could not identify any trackable items"}.',
+    "Reply with JSON only, no markdown.",
+])
+
+# The system prompts hold no per-request values, so every call starts with
+# the same bytes and OpenAI's automatic prompt caching can reuse the prefix;
+# the date and coach numbers follow in a separate message
+FOOD_LOG_SYSTEM_PROMPT = (
+    "You are a nutrition and fitness tracking assistant.\n" + BASE_RULES
+    + "\nSchema: " + FOOD_LOG_SCHEMA
+)
+
+COACH_ADDENDUM = "\n".join([
+    "You are also the user's supportive coach: add coach_feedback, encouraging and never judgmental, based on their goal and progress.",
+    "- lose: under target, encourage (\"You still have X kcal to enjoy today\"); slightly over, reassure (one meal doesn't define the journey); celebrate healthy choices and exercise.",
+    "- gain: under target, suggest a healthy snack or protein shake; at target, celebrate; favour calorie-dense nutritious foods.",
+    "- maintain: near target, praise the balance; far off, correct course gently.",
+    "Be specific with earned praise and constructive, never critical.",
+])
+
+FOOD_LOG_SYSTEM_PROMPT_WITH_COACH = (
+    "You are a nutrition and fitness tracking assistant.\n" + BASE_RULES
+    + "\n" + COACH_ADDENDUM + "\nSchema: " + COACH_SCHEMA
+)
+
+
+# Parsed replies are reused for a day; keys include today's date anyway
+LLM_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Photos are shrunk to this longest edge before upload; the vision model
+# tiles anything larger down anyway, so extra pixels only cost bandwidth
+MAX_IMAGE_EDGE = 1024
+# Uploads smaller than this (bytes) are sent without re-encoding
+IMAGE_RESIZE_MIN_BYTES = 200_000
+# Images no larger than this fit in a single low-detail tile
+LOW_DETAIL_EDGE = 512
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_openai_client(api_key: str):
+    """
+    Return the process-wide OpenAI client for an API key, creating it once.
+
+    Sharing the client keeps its HTTP connection pool warm across requests
+    instead of opening a new TCP/TLS connection for every AI call.
+    """
+    client = _clients.get(api_key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(api_key)
+            if client is None:
+                # Imported here: the openai SDK takes ~0.3s to import and is
+                # only needed once a client is actually requested
+                from openai import OpenAI
+                client = _clients[api_key] = OpenAI(api_key=api_key)
+    return client
+
+
+def prepare_image(image_data: bytes, content_type: str) -> tuple:
+    """
+    Shrink a food photo before it is base64-encoded for the vision API.
+
+    Large uploads are resized to MAX_IMAGE_EDGE and re-encoded as JPEG q=85;
+    images that already fit a low-detail tile are flagged as such. Returns
+    (image_data, content_type, detail). Without Pillow, or for anything
+    Pillow cannot read, the upload is passed through unchanged.
+    """
+    if Image is None:
+        return image_data, content_type, "high"
+    try:
+        img = Image.open(io.BytesIO(image_data))
+        if max(img.size) <= LOW_DETAIL_EDGE:
+            return image_data, content_type, "low"
+        if len(image_data) < IMAGE_RESIZE_MIN_BYTES:
+            return image_data, content_type, "high"
+        # Phone photos carry their rotation in EXIF, which re-encoding drops
+        img = ImageOps.exif_transpose(img)
+        img.thumbnail((MAX_IMAGE_EDGE, MAX_IMAGE_EDGE), Image.Resampling.LANCZOS)
+        if img.mode in ("RGBA", "LA", "PA") or "transparency" in img.info:
+            # JPEG has no alpha; flatten onto white rather than black
+            img = img.convert("RGBA")
+            background = Image.new("RGB", img.size, "white")
+            background.paste(img, mask=img.getchannel("A"))
+            img = background
+        buffer = io.BytesIO()
+        img.convert("RGB").save(buffer, "JPEG", quality=85, optimize=True)
+    except Exception:
+        return image_data, content_type, "high"
+    return buffer.getvalue(), "image/jpeg", "high"
+
+
+class _StreamedItemScanner:
+    """
+    Pull completed objects out of selected top-level arrays of a JSON document
+    that arrives in pieces, e.g. each {...} in "dietary": [...] as soon as its
+    closing brace streams in.
+    """
+
+    def __init__(self, keys):
+        self.keys = set(keys)
+        self.text = ''
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._string_start = None
+        self._last_key = None
+        self._array_key = None
+        self._item_start = None
+
+    def feed(self, chunk: str) -> list:
+        """Add a chunk of the reply; return (key, item) for each object it completes."""
+        self.text += chunk
+        found = []
+        text = self.text
+        for i in range(self._pos, len(text)):
+            ch = text[i]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == '\\':
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._string_start is not None:
+                        self._last_key = text[self._string_start + 1:i]
+                        self._string_start = None
+            elif ch == '"':
+                self._in_string = True
+                # Strings directly inside the top-level object are (mostly) keys
+                if self._depth == 1:
+                    self._string_start = i
+            elif ch in '{[':
+                if ch == '[' and self._depth == 1 and self._last_key in self.keys:
+                    self._array_key = self._last_key
+                elif ch == '{' and self._depth == 2 and self._array_key:
+                    self._item_start = i
+                self._depth += 1
+            elif ch in '}]':
+                self._depth -= 1
+                if ch == '}' and self._depth == 2 and self._item_start is not None:
+                    try:
+                        found.append((self._array_key, json.loads(text[self._item_start:i + 1])))
+                    except ValueError:
+                        pass
+                    self._item_start = None
+                elif ch == ']' and self._depth == 1:
+                    self._array_key = None
+        self._pos = len(text)
+        return found
 
 
 class AIFoodLogService:
     """Service for parsing food data using OpenAI GPT-4o."""
 
+    ALLOWED_IMAGE_TYPES = ('image/jpeg', 'image/png', 'image/gif', 'image/webp')
+
     def __init__(self, user_context: dict = None):
         """
         Initialize the AI service.
@@ -117,32 +208,37 @@ class AIFoodLogService:
         api_key = os.environ.get('OPENAI_API_KEY')
         if not api_key:
             raise ValueError("OPENAI_API_KEY environment variable is not set")
-        self.client = OpenAI(api_key=api_key)
+        self.api_key = api_key
+        self.client = get_openai_client(api_key)
         self.model = "gpt-4o"
         self.user_context = user_context
 
-    def _get_system_prompt(self) -> str:
-        """Get system prompt with today's date and optional user context."""
+    def _system_messages(self) -> list:
+        """System messages: the static prompt, then today's date and user context."""
         today_str = date.today().strftime('%Y-%m-%d')
 
         # Use coach prompt if user context is available
         if self.user_context and all(k in self.user_context for k in ['goal', 'daily_calorie_goal']):
-            goal_display = {
-                'lose': 'lose',
-                'gain': 'gain',
-                'maintain': 'maintain'
-            }.get(self.user_context['goal'], 'maintain')
-
-            return FOOD_LOG_SYSTEM_PROMPT_WITH_COACH.format(
-                today=today_str,
-                goal=goal_display,
-                daily_calorie_goal=self.user_context.get('daily_calorie_goal', 2000),
-                calories_today=self.user_context.get('calories_today', 0),
-                calories_remaining=self.user_context.get('calories_remaining', 2000)
-            )
+            goal = self.user_context['goal']
+            goal_display = goal if goal in ('lose', 'gain', 'maintain') else 'maintain'
+            calories_today = self.user_context.get('calories_today', 0)
+            calories_remaining = self.user_context.get('calories_remaining', 2000)
+
+            return [
+                {"role": "system", "content": FOOD_LOG_SYSTEM_PROMPT_WITH_COACH},
+                {"role": "system", "content": (
+                    f"Date: {today_str}\n"
+                    f"User: goal={goal_display} weight, "
+                    f"daily target {self.user_context.get('daily_calorie_goal', 2000)} kcal, "
+                    f"eaten today {calories_today} kcal, remaining {calories_remaining} kcal"
+                )},
+            ]
 
         # Fall back to basic prompt
-        return FOOD_LOG_SYSTEM_PROMPT.format(today=today_str)
+        return [
+            {"role": "system", "content": FOOD_LOG_SYSTEM_PROMPT},
+            {"role": "system", "content": f"Date: {today_str}"},
+        ]
 
     def _parse_response(self, response_text: str) -> dict:
         """Parse AI response text into structured data."""
@@ -154,6 +250,99 @@ class AIFoodLogService:
         except json.JSONDecodeError as e:
             return {"success": False, "error": f"Failed to parse AI response: {str(e)}"}
 
+    def _completion_kwargs(self, user_content) -> dict:
+        """Chat completion arguments shared by the text and image requests."""
+        return {
+            "model": self.model,
+            "messages": [
+                *self._system_messages(),
+                {"role": "user", "content": user_content}
+            ],
+            "response_format": {"type": "json_object"},
+            "max_tokens": 1000,
+            "temperature": 0.3,
+        }
+
+    def _text_content(self, user_text: str) -> str:
+        """User message for a natural language food description."""
+        return f"Log this food: {user_text}"
+
+    def _image_prompt(self, context: str = "") -> dict:
+        """Text part sent alongside a food photo."""
+        return {
+            "type": "text",
+            "text": f"Identify and log the food in this image.{' Additional context: ' + context if context else ''}"
+        }
+
+    def _image_content(self, image_data: bytes, content_type: str, context: str = "") -> list:
+        """User message carrying a food photo and optional context."""
+        image_data, content_type, detail = prepare_image(image_data, content_type)
+        # Encode image to base64
+        base64_image = base64.b64encode(image_data).decode('utf-8')
+        return [
+            self._image_prompt(context),
+            {
+                "type": "image_url",
+                "image_url": {
+                    "url": f"data:{content_type};base64,{base64_image}",
+                    "detail": detail
+                }
+            }
+        ]
+
+    def _validate_image(self, image_data: bytes, content_type: str):
+        """Return an error result for an unusable image, otherwise None."""
+        if not image_data:
+            return {"success": False, "error": "No image provided"}
+        if content_type not in self.ALLOWED_IMAGE_TYPES:
+            return {"success": False, "error": f"Unsupported image type: {content_type}"}
+        return None
+
+    def _cache_key(self, completion_kwargs: dict, *raw_parts: bytes) -> str:
+        """
+        Cache key for a parse request: a hash of the exact completion
+        arguments (model, system messages with date and coach numbers, user
+        message), plus any raw bytes sent alongside them.
+        """
+        digest = hashlib.sha256(json.dumps(completion_kwargs, sort_keys=True).encode())
+        for part in raw_parts:
+            digest.update(b'|')
+            digest.update(part)
+        return f'ai-parse:{digest.hexdigest()}'
+
+    def _text_cache_key(self, user_text: str) -> str:
+        """Cache key for a text request."""
+        return self._cache_key(self._completion_kwargs(self._text_content(user_text)))
+
+    def _image_cache_key(self, image_data: bytes, content_type: str, context: str) -> str:
+        """
+        Cache key for an image request. Hashes the raw upload instead of the
+        downscaled base64 payload, so a cache hit skips preparing the image.
+        """
+        return self._cache_key(
+            self._completion_kwargs([self._image_prompt(context)]),
+            content_type.encode(),
+            image_data,
+        )
+
+    def _complete(self, cache_key: str, build_content, *args) -> dict:
+        """
+        Run one blocking chat completion and parse its JSON reply, unless the
+        reply is cached. The user message is only built (build_content(*args))
+        on a cache miss.
+        """
+        result = cache.get(cache_key)
+        if result is not None:
+            return result
+        try:
+            response = self.client.chat.completions.create(**self._completion_kwargs(build_content(*args)))
+            result = self._parse_response(response.choices[0].message.content)
+        except Exception as e:
+            return {"success": False, "error": f"AI service error: {str(e)}"}
+        if result['success']:
+            cache.set(cache_key, result, LLM_CACHE_TIMEOUT)
+        return result
+
     def parse_text_input(self, user_text: str) -> dict:
         """
         Parse natural language food description.
@@ -166,24 +355,7 @@ class AIFoodLogService:
         """
         if not user_text or not user_text.strip():
             return {"success": False, "error": "No text provided"}
-
-        try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": self._get_system_prompt()},
-                    {"role": "user", "content": f"Log this food: {user_text}"}
-                ],
-                response_format={"type": "json_object"},
-                max_tokens=1000,
-                temperature=0.3
-            )
-
-            response_text = response.choices[0].message.content
-            return self._parse_response(response_text)
-
-        except Exception as e:
-            return {"success": False, "error": f"AI service error: {str(e)}"}
+        return self._complete(self._text_cache_key(user_text), self._text_content, user_text)
 
     def parse_image_input(self, image_data: bytes, content_type: str, context: str = "") -> dict:
         """
@@ -197,46 +369,78 @@ class AIFoodLogService:
         Returns:
             dict with 'success' boolean and either 'data' or 'error'
         """
-        if not image_data:
-            return {"success": False, "error": "No image provided"}
-
-        # Validate content type
-        allowed_types = ['image/jpeg', 'image/png', 'image/gif', 'image/webp']
-        if content_type not in allowed_types:
-            return {"success": False, "error": f"Unsupported image type: {content_type}"}
+        error = self._validate_image(image_data, content_type)
+        if error:
+            return error
+        return self._complete(
+            self._image_cache_key(image_data, content_type, context),
+            self._image_content, image_data, content_type, context
+        )
+
+    def _stream(self, cache_key: str, build_content, *args):
+        """
+        Run a streamed chat completion.
 
+        Yields ('item', {'kind': 'dietary'|'exercise', 'item': {...}}) for each
+        entry as soon as the model finishes writing it, then a final
+        ('result', result) with the same dict the parse_* methods return.
+        A cached reply is replayed as the same events.
+        """
+        result = cache.get(cache_key)
+        if result is not None:
+            for kind in ('dietary', 'exercise'):
+                for item in result['data'].get(kind) or []:
+                    yield 'item', {'kind': kind, 'item': item}
+            yield 'result', result
+            return
+
+        scanner = _StreamedItemScanner(('dietary', 'exercise'))
         try:
-            # Encode image to base64
-            base64_image = base64.b64encode(image_data).decode('utf-8')
-
-            # Build user message with image
-            user_content = [
-                {
-                    "type": "text",
-                    "text": f"Identify and log the food in this image.{' Additional context: ' + context if context else ''}"
-                },
-                {
-                    "type": "image_url",
-                    "image_url": {
-                        "url": f"data:{content_type};base64,{base64_image}",
-                        "detail": "high"
-                    }
-                }
-            ]
-
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": self._get_system_prompt()},
-                    {"role": "user", "content": user_content}
-                ],
-                response_format={"type": "json_object"},
-                max_tokens=1000,
-                temperature=0.3
-            )
-
-            response_text = response.choices[0].message.content
-            return self._parse_response(response_text)
-
+            stream = self.client.chat.completions.create(stream=True, **self._completion_kwargs(build_content(*args)))
+            for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    for kind, item in scanner.feed(delta):
+                        yield 'item', {'kind': kind, 'item': item}
         except Exception as e:
-            return {"success": False, "error": f"AI service error: {str(e)}"}
+            yield 'result', {"success": False, "error": f"AI service error: {str(e)}"}
+            return
+        result = self._parse_response(scanner.text)
+        if result['success']:
+            cache.set(cache_key, result, LLM_CACHE_TIMEOUT)
+        yield 'result', result
+
+    def stream_text_input(self, user_text: str):
+        """Streaming version of parse_text_input; see _stream for the events."""
+        if not user_text or not user_text.strip():
+            yield 'result', {"success": False, "error": "No text provided"}
+            return
+        yield from self._stream(self._text_cache_key(user_text), self._text_content, user_text)
+
+    def stream_image_input(self, image_data: bytes, content_type: str, context: str = ""):
+        """Streaming version of parse_image_input; see _stream for the events."""
+        error = self._validate_image(image_data, content_type)
+        if error:
+            yield 'result', error
+            return
+        yield from self._stream(
+            self._image_cache_key(image_data, content_type, context),
+            self._image_content, image_data, content_type, context
+        )
+
+    def batch_request(self, custom_id: str, user_text: str) -> dict:
+        """One line of a Batch API input file: a text parse keyed by custom_id."""
+        return {
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": self._completion_kwargs(self._text_content(user_text)),
+        }
+
+    def parse_batch_result(self, line: dict) -> dict:
+        """Turn one line of a Batch API output file into a parse result."""
+        response = line.get("response") or {}
+        if line.get("error") or response.get("status_code") != 200:
+            error = (line.get("error") or {}).get("message") or f"Batch request failed: HTTP {response.get('status_code')}"
+            return {"success": False, "error": error}
+        return self._parse_response(response["body"]["choices"][0]["message"]["content"])
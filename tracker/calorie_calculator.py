@@ -133,39 +133,8 @@ def calculate_calorie_goal_for_user(user):
     )
 
 
-def get_calorie_status(user):
-    """
-    Get the user's calorie status for today.
-
-    Returns:
-        dict with:
-            - daily_goal: int or None
-            - calories_consumed: int
-            - calories_remaining: int (for lose/maintain) or calories_to_surpass (for gain)
-            - fitness_goal: str
-            - progress_percent: float (0-100+)
-            - status: 'under', 'on_track', 'over'
-    """
-    from django.utils import timezone
-    from django.db.models import Sum
-    from .models import DietaryEntry
-
-    today = timezone.now().date()
-
-    # Get daily goal
-    daily_goal = calculate_calorie_goal_for_user(user)
-    if daily_goal is None:
-        return None
-
-    # Get today's consumed calories
-    calories_consumed = DietaryEntry.objects.filter(
-        user=user,
-        date=today
-    ).aggregate(total=Sum('calories'))['total'] or 0
-
-    # Get fitness goal
-    fitness_goal = user.profile.fitness_goal
-
+def _calorie_status(daily_goal: int, calories_consumed: int, fitness_goal: str) -> dict:
+    """Build the calorie status dict from a day's goal and intake."""
     # Calculate remaining/surplus
     calories_remaining = daily_goal - calories_consumed
     progress_percent = (calories_consumed / daily_goal * 100) if daily_goal > 0 else 0
@@ -203,3 +172,80 @@ def get_calorie_status(user):
         'progress_percent': min(progress_percent, 150),  # Cap at 150% for display
         'status': status,
     }
+
+
+def bulk_calorie_status(users) -> dict:
+    """
+    Get today's calorie status for several users in a single query.
+
+    Each user's profile, latest weight and calories eaten today are loaded
+    together (joined profile plus two correlated subqueries) instead of
+    two or three queries per user.
+
+    Args:
+        users: QuerySet of Django User instances
+
+    Returns:
+        dict mapping user id to the get_calorie_status() dict, or to None
+        when that user's profile or weight history is incomplete
+    """
+    from django.utils import timezone
+    from django.db.models import OuterRef, Subquery, Sum
+    from .models import DietaryEntry, WeightEntry
+
+    today = timezone.now().date()
+
+    latest_weight = WeightEntry.objects.filter(
+        user=OuterRef('pk')
+    ).order_by('-date').values('weight_kg')[:1]
+    calories_today = DietaryEntry.objects.filter(
+        user=OuterRef('pk'),
+        date=today
+    ).values('user').annotate(total=Sum('calories')).values('total')
+
+    statuses = {}
+    for user in users.select_related('profile').annotate(
+        latest_weight=Subquery(latest_weight),
+        calories_today=Subquery(calories_today),
+    ):
+        profile = getattr(user, 'profile', None)
+        if profile is None or not profile.is_calorie_profile_ready() or user.latest_weight is None:
+            statuses[user.pk] = None
+            continue
+
+        daily_goal = calculate_daily_calorie_goal(
+            weight_kg=float(user.latest_weight),
+            height_cm=float(profile.height_cm),
+            age=profile.age,
+            gender=profile.gender,
+            activity_level=profile.activity_level,
+            fitness_goal=profile.fitness_goal
+        )
+        statuses[user.pk] = _calorie_status(daily_goal, user.calories_today or 0, profile.fitness_goal)
+    return statuses
+
+
+def get_calorie_status(user):
+    """
+    Get the user's calorie status for today.
+
+    Returns:
+        dict with:
+            - daily_goal: int or None
+            - calories_consumed: int
+            - calories_remaining: int (for lose/maintain) or calories_to_surpass (for gain)
+            - fitness_goal: str
+            - progress_percent: float (0-100+)
+            - status: 'under', 'on_track', 'over'
+    """
+    from django.contrib.auth.models import User
+
+    # Most users never fill in the profile; skip the query for them
+    try:
+        profile = user.profile
+    except AttributeError:
+        return None
+    if not profile.is_calorie_profile_ready():
+        return None
+
+    return bulk_calorie_status(User.objects.filter(pk=user.pk)).get(user.pk)
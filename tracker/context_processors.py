@@ -1,8 +1,13 @@
 def for_her(request):
     """Make FOR_HER available in templates based on user group membership."""
+    # Computed once per request, however many templates are rendered
+    if hasattr(request, '_for_her'):
+        return {'FOR_HER': request._for_her}
+
     is_special = False
     if request.user.is_authenticated:
         is_special = request.user.groups.filter(name='special').exists()
+    request._for_her = is_special
     return {
         'FOR_HER': is_special
     }
@@ -0,0 +1,141 @@
+import json
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from tracker.ai_service import AIFoodLogService
+from tracker.models import DietaryEntry, bump_entry_version
+
+# Batches finish within 24h, so there is no point polling more often than this
+MAX_POLL_INTERVAL = 10 * 60
+FINISHED_STATUSES = ('completed', 'failed', 'expired', 'cancelled')
+
+
+class Command(BaseCommand):
+    help = (
+        'Re-estimate dietary entry calories through the OpenAI Batch API '
+        '(half the price of live requests, results within 24h)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help='Only reclassify entries of this username')
+        parser.add_argument('--since', help='Only reclassify entries on or after this date (YYYY-MM-DD)')
+        parser.add_argument(
+            '--batch-id',
+            help='Resume waiting on an already submitted batch instead of creating one',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=30,
+            help='Seconds before the first status check; doubles up to 10 minutes',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Skip the confirmation prompt before overwriting calories',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Build the batch file and report its size without submitting it',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            service = AIFoodLogService()
+        except ValueError as e:
+            raise CommandError(str(e))
+        client = service.client
+
+        batch_id = options['batch_id']
+        if not batch_id:
+            entries = DietaryEntry.objects.exclude(item='').only('id', 'item', 'notes').order_by('id')
+            if options['user']:
+                entries = entries.filter(user__username=options['user'])
+            if options['since']:
+                entries = entries.filter(date__gte=options['since'])
+
+            with tempfile.TemporaryFile() as batch_file:
+                count = 0
+                for entry in entries.iterator(chunk_size=2000):
+                    text = f'{entry.item} ({entry.notes})' if entry.notes else entry.item
+                    line = service.batch_request(str(entry.id), text)
+                    batch_file.write(json.dumps(line).encode() + b'\n')
+                    count += 1
+
+                if not count:
+                    self.stdout.write(self.style.WARNING('No dietary entries to reclassify.'))
+                    return
+                if options['dry_run']:
+                    self.stdout.write(f'Would submit {count} entries ({batch_file.tell()} bytes).')
+                    return
+
+                batch_file.seek(0)
+                uploaded = client.files.create(file=('reclassify.jsonl', batch_file), purpose='batch')
+            batch = client.batches.create(
+                input_file_id=uploaded.id,
+                endpoint='/v1/chat/completions',
+                completion_window='24h',
+            )
+            batch_id = batch.id
+            self.stdout.write(f'Submitted batch {batch_id} with {count} entries.')
+
+        delay = options['poll_interval']
+        while True:
+            batch = client.batches.retrieve(batch_id)
+            if batch.status in FINISHED_STATUSES:
+                break
+            self.stdout.write(f'Batch {batch_id} is {batch.status}; checking again in {delay:g}s.')
+            time.sleep(delay)
+            delay = min(delay * 2, MAX_POLL_INTERVAL)
+
+        # Expired or cancelled batches still return the requests that finished
+        if not batch.output_file_id:
+            raise CommandError(f'Batch {batch_id} ended as {batch.status} with no results.')
+
+        calories = {}
+        failed = 0
+        for raw in client.files.content(batch.output_file_id).text.splitlines():
+            if not raw.strip():
+                continue
+            # One malformed line (e.g. "350 kcal") must not sink the whole batch
+            try:
+                line = json.loads(raw)
+                result = service.parse_batch_result(line)
+                dietary = result.get('data', {}).get('dietary') or []
+                total = sum(int(item.get('calories') or 0) for item in dietary)
+                entry_id = int(line['custom_id'])
+            except (ValueError, TypeError, KeyError, AttributeError, IndexError):
+                failed += 1
+                continue
+            if result['success'] and total > 0:
+                calories[entry_id] = total
+            else:
+                failed += 1
+
+        entries = DietaryEntry.objects.only('id', 'user_id', 'calories').in_bulk(list(calories))
+        changed = []
+        for pk, entry in entries.items():
+            if entry.calories != calories[pk]:
+                entry.calories = calories[pk]
+                changed.append(entry)
+        if changed and not options['force']:
+            confirm = input(f'Overwrite the calories of {len(changed)} dietary entries? (yes/no): ')
+            if confirm.lower() != 'yes':
+                self.stdout.write(self.style.WARNING(
+                    f'Aborted. Rerun with --batch-id {batch_id} to apply these results later.'
+                ))
+                return
+
+        with transaction.atomic():
+            DietaryEntry.objects.bulk_update(changed, ['calories'], batch_size=500)
+            # bulk_update sends no post_save, so invalidate cached charts here
+            for user_id in {entry.user_id for entry in changed}:
+                bump_entry_version(user_id)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Batch {batch_id} {batch.status}: updated {len(changed)} entries, '
+            f'{len(calories) - len(changed)} unchanged, {failed} failed.'
+        ))
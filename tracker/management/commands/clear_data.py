@@ -1,5 +1,7 @@
 from django.core.management.base import BaseCommand
-from tracker.models import DietaryEntry, ExerciseEntry, WeightEntry
+from django.db import connection, transaction
+from django.db.models import F
+from tracker.models import DietaryEntry, ExerciseEntry, WeightEntry, UserProfile
 
 
 class Command(BaseCommand):
@@ -23,9 +25,21 @@ class Command(BaseCommand):
         exercise_count = ExerciseEntry.objects.count()
         weight_count = WeightEntry.objects.count()
 
-        DietaryEntry.objects.all().delete()
-        ExerciseEntry.objects.all().delete()
-        WeightEntry.objects.all().delete()
+        # One statement per table instead of .delete(), which loads every row
+        # to send post_delete; nothing else references these tables
+        tables = [
+            connection.ops.quote_name(model._meta.db_table)
+            for model in (DietaryEntry, ExerciseEntry, WeightEntry)
+        ]
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                if connection.vendor == 'postgresql':
+                    cursor.execute(f'TRUNCATE TABLE {", ".join(tables)} RESTART IDENTITY')
+                else:
+                    for table in tables:
+                        cursor.execute(f'DELETE FROM {table}')
+            # The skipped post_delete signals would have invalidated cached charts
+            UserProfile.objects.update(entry_version=F('entry_version') + 1)
 
         self.stdout.write(self.style.SUCCESS(
             f'Deleted {dietary_count} dietary entries, '
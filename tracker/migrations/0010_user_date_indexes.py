@@ -0,0 +1,31 @@
+# Generated by Django 4.2.27 on 2026-10-15 23:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tracker", "0009_remove_dietaryentry_coach_remark"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="dietaryentry",
+            index=models.Index(
+                fields=["user", "-date"], name="tracker_die_user_id_72a76c_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="exerciseentry",
+            index=models.Index(
+                fields=["user", "-date"], name="tracker_exe_user_id_dc40ff_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="weightentry",
+            index=models.Index(
+                fields=["user", "-date"], name="tracker_wei_user_id_5b976e_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.27 on 2026-10-15 23:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tracker", "0010_user_date_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="userprofile",
+            name="entry_version",
+            field=models.PositiveBigIntegerField(
+                default=0,
+                editable=False,
+                help_text="Bumped whenever the user's entries change; keys cached dashboard charts",
+            ),
+        ),
+    ]
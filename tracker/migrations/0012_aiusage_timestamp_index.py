@@ -0,0 +1,19 @@
+# Generated by Django 4.2.27 on 2026-10-15 23:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tracker", "0011_userprofile_entry_version"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="aiusage",
+            index=models.Index(
+                fields=["-timestamp"], name="tracker_aiu_timesta_3031d5_idx"
+            ),
+        ),
+    ]
@@ -1,6 +1,6 @@
 from django.db import models
 from django.contrib.auth import get_user_model
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 
 User = get_user_model()
@@ -85,6 +85,21 @@ class UserProfile(models.Model):
         default=False,
         help_text="Whether user has completed calorie goal setup"
     )
+    entry_version = models.PositiveBigIntegerField(
+        default=0,
+        editable=False,
+        help_text="Bumped whenever the user's entries change; keys cached dashboard charts"
+    )
+
+    def save(self, *args, **kwargs):
+        # entry_version only moves through bump_entry_version's UPDATE; a full
+        # save of an instance loaded earlier would write the old count back
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'entry_version'
+            ]
+        super().save(*args, **kwargs)
 
     def __str__(self):
         partner_name = self.partner.username if self.partner else "No partner"
@@ -125,6 +140,7 @@ def save_user_profile(sender, instance, **kwargs):
     except UserProfile.DoesNotExist:
         UserProfile.objects.create(user=instance)
 
+
 class DietaryEntry(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='dietary_entries')
     date = models.DateField()
@@ -133,6 +149,11 @@ class DietaryEntry(models.Model):
     notes = models.TextField(blank=True)  # per-item note (e.g. "vomited roughly half")
     remarks = models.TextField(blank=True)  # AI coach feedback / meal context
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', '-date']),
+        ]
+
     def __str__(self):
         return f"Dietary {self.user} {self.date} - {self.item} ({self.calories} kcal)"
 
@@ -144,6 +165,11 @@ class ExerciseEntry(models.Model):
     calories_burned = models.IntegerField(blank=True, null=True)
     remarks = models.TextField(blank=True)  # daily remarks
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', '-date']),
+        ]
+
     def __str__(self):
         return f"Exercise {self.activity} for {self.user} on {self.date}"
 
@@ -153,10 +179,31 @@ class WeightEntry(models.Model):
     weight_kg = models.DecimalField(max_digits=5, decimal_places=2)
     notes = models.TextField(blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', '-date']),
+        ]
+
     def __str__(self):
         return f"Weight {self.weight_kg} kg on {self.date} ({self.user})"
 
 
+def bump_entry_version(user_id):
+    """Invalidate the cached dashboard charts of ``user_id``."""
+    UserProfile.objects.filter(user_id=user_id).update(entry_version=models.F('entry_version') + 1)
+
+
+@receiver([post_save, post_delete], sender=DietaryEntry)
+@receiver([post_save, post_delete], sender=ExerciseEntry)
+@receiver([post_save, post_delete], sender=WeightEntry)
+def entry_changed(sender, instance, origin=None, **kwargs):
+    """Bump the owner's entry version when one of their entries is saved or deleted."""
+    # Deleting the user removes the profile along with the version
+    if isinstance(origin, User):
+        return
+    bump_entry_version(instance.user_id)
+
+
 class AIUsage(models.Model):
     """Track AI API usage per user for rate limiting and cost monitoring."""
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='ai_usage')
@@ -172,6 +219,7 @@ class AIUsage(models.Model):
     class Meta:
         ordering = ['-timestamp']
         indexes = [
+            models.Index(fields=['-timestamp']),
             models.Index(fields=['user', 'timestamp']),
             models.Index(fields=['user', 'request_type', 'timestamp']),
         ]
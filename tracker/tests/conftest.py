@@ -90,53 +90,46 @@ def weight_entry(db, user):
 @pytest.fixture
 def multiple_dietary_entries(db, user, authenticated_client):
     """Create multiple dietary entries across several days."""
-    entries = []
     today = date.today()
-    for i in range(7):
-        entry_date = today - timedelta(days=i)
-        entry = DietaryEntry.objects.create(
+    return DietaryEntry.objects.bulk_create([
+        DietaryEntry(
             user=user,
-            date=entry_date,
+            date=today - timedelta(days=i),
             item=f'Food Day {i}',
             calories=400 + (i * 50),
             notes=f'Notes for day {i}'
         )
-        entries.append(entry)
-    return entries
+        for i in range(7)
+    ])
 
 
 @pytest.fixture
 def multiple_exercise_entries(db, user, authenticated_client):
     """Create multiple exercise entries across several days."""
-    entries = []
     today = date.today()
-    for i in range(7):
-        entry_date = today - timedelta(days=i)
-        entry = ExerciseEntry.objects.create(
+    return ExerciseEntry.objects.bulk_create([
+        ExerciseEntry(
             user=user,
-            date=entry_date,
+            date=today - timedelta(days=i),
             activity=f'Activity Day {i}',
             duration_minutes=30 + (i * 5),
             calories_burned=200 + (i * 20)
         )
-        entries.append(entry)
-    return entries
+        for i in range(7)
+    ])
 
 
 @pytest.fixture
 def multiple_weight_entries(db, user, authenticated_client):
     """Create multiple weight entries across several days."""
-    entries = []
     today = date.today()
     base_weight = Decimal('70.0')
-    for i in range(10):
-        entry_date = today - timedelta(days=i)
-        weight = base_weight + Decimal(str(i * 0.1))
-        entry = WeightEntry.objects.create(
+    return WeightEntry.objects.bulk_create([
+        WeightEntry(
             user=user,
-            date=entry_date,
-            weight_kg=weight,
+            date=today - timedelta(days=i),
+            weight_kg=base_weight + Decimal(str(i * 0.1)),
             notes=f'Day {i} weight'
         )
-        entries.append(entry)
-    return entries
+        for i in range(10)
+    ])
@@ -4,8 +4,8 @@ Tests for tracker admin configuration.
 import pytest
 from django.contrib import admin
 from django.contrib.admin.sites import AdminSite
-from tracker.models import DietaryEntry, ExerciseEntry, WeightEntry
-from tracker.admin import DietaryEntryAdmin, ExerciseEntryAdmin, WeightEntryAdmin
+from tracker.models import DietaryEntry, ExerciseEntry, WeightEntry, AIUsage
+from tracker.admin import DietaryEntryAdmin, ExerciseEntryAdmin, WeightEntryAdmin, AIUsageAdmin, user_name
 
 
 # ============================================================================
@@ -45,11 +45,28 @@ class TestDietaryEntryAdmin:
     
     def test_list_display(self, admin_instance):
         """Test list_display configuration."""
-        assert admin_instance.list_display == ('user', 'date', 'item', 'calories', 'notes')
+        assert admin_instance.list_display == (user_name, 'date', 'item', 'calories', 'notes')
     
     def test_list_filter(self, admin_instance):
         """Test list_filter configuration."""
-        assert admin_instance.list_filter == ('date', 'user')
+        assert admin_instance.list_filter == ('date', ('user', admin.RelatedOnlyFieldListFilter))
+    
+    def test_autocomplete_fields(self, admin_instance):
+        """User picker should search via AJAX rather than list every user."""
+        assert admin_instance.autocomplete_fields == ('user',)
+    
+    def test_list_select_related(self, admin_instance):
+        """Changelist should join the user in the same query."""
+        assert admin_instance.list_select_related == ('user',)
+    
+    def test_list_only(self, admin_instance):
+        """Changelist should only load the displayed columns."""
+        assert admin_instance.list_only == ('user__username', 'date', 'item', 'calories', 'notes')
+    
+    def test_user_name_column(self, admin_instance, dietary_entry):
+        """User column shows the username and sorts by it."""
+        assert user_name(dietary_entry) == dietary_entry.user.username
+        assert user_name.admin_order_field == 'user__username'
     
     def test_search_fields(self, admin_instance):
         """Test search_fields configuration."""
@@ -71,11 +88,23 @@ class TestExerciseEntryAdmin:
     
     def test_list_display(self, admin_instance):
         """Test list_display configuration."""
-        assert admin_instance.list_display == ('user', 'date', 'activity', 'duration_minutes', 'calories_burned')
+        assert admin_instance.list_display == (user_name, 'date', 'activity', 'duration_minutes', 'calories_burned')
     
     def test_list_filter(self, admin_instance):
         """Test list_filter configuration."""
-        assert admin_instance.list_filter == ('date', 'user')
+        assert admin_instance.list_filter == ('date', ('user', admin.RelatedOnlyFieldListFilter))
+    
+    def test_autocomplete_fields(self, admin_instance):
+        """User picker should search via AJAX rather than list every user."""
+        assert admin_instance.autocomplete_fields == ('user',)
+    
+    def test_list_select_related(self, admin_instance):
+        """Changelist should join the user in the same query."""
+        assert admin_instance.list_select_related == ('user',)
+    
+    def test_list_only(self, admin_instance):
+        """Changelist should only load the displayed columns."""
+        assert admin_instance.list_only == ('user__username', 'date', 'activity', 'duration_minutes', 'calories_burned')
     
     def test_search_fields(self, admin_instance):
         """Test search_fields configuration."""
@@ -97,8 +126,49 @@ class TestWeightEntryAdmin:
     
     def test_list_display(self, admin_instance):
         """Test list_display configuration."""
-        assert admin_instance.list_display == ('user', 'date', 'weight_kg')
+        assert admin_instance.list_display == (user_name, 'date', 'weight_kg')
     
     def test_list_filter(self, admin_instance):
         """Test list_filter configuration."""
-        assert admin_instance.list_filter == ('date', 'user')
+        assert admin_instance.list_filter == ('date', ('user', admin.RelatedOnlyFieldListFilter))
+    
+    def test_autocomplete_fields(self, admin_instance):
+        """User picker should search via AJAX rather than list every user."""
+        assert admin_instance.autocomplete_fields == ('user',)
+    
+    def test_list_select_related(self, admin_instance):
+        """Changelist should join the user in the same query."""
+        assert admin_instance.list_select_related == ('user',)
+    
+    def test_list_only(self, admin_instance):
+        """Changelist should only load the displayed columns."""
+        assert admin_instance.list_only == ('user__username', 'date', 'weight_kg')
+
+
+# ============================================================================
+# AIUsage Admin Tests
+# ============================================================================
+
+class TestAIUsageAdmin:
+    """Tests for AIUsageAdmin configuration."""
+
+    @pytest.fixture
+    def admin_instance(self):
+        """Create admin instance."""
+        site = AdminSite()
+        return AIUsageAdmin(AIUsage, site)
+
+    def test_list_select_related(self, admin_instance):
+        """Changelist should join the user shown in the 'user' column."""
+        assert admin_instance.list_select_related == ('user',)
+
+    def test_success_badge_uses_css_classes(self, admin_instance):
+        """Status badge should reference the stylesheet classes, not inline styles."""
+        assert admin_instance.success_badge(AIUsage(success=True)) == '<span class="ai-badge ai-ok">✓ Success</span>'
+        assert admin_instance.success_badge(AIUsage(success=False)) == '<span class="ai-badge ai-fail">✗ Failed</span>'
+        assert 'tracker/css/admin.css' in str(admin_instance.media)
+
+    def test_skips_full_result_count(self, admin_instance):
+        """Changelist should not count the whole usage table on every page."""
+        assert admin_instance.show_full_result_count is False
+        assert admin_instance.list_per_page == 50
@@ -1,11 +1,13 @@
 """
 Tests for tracker management commands.
 """
+import json
 import pytest
 from io import StringIO
+from types import SimpleNamespace
 from datetime import date
 from decimal import Decimal
-from django.core.management import call_command
+from django.core.management import call_command, CommandError
 from django.contrib.auth.models import User
 from tracker.models import DietaryEntry, ExerciseEntry, WeightEntry
 
@@ -81,3 +83,130 @@ class TestClearDataCommand:
         call_command('clear_data', '--force', stdout=out)
         
         assert User.objects.filter(username='testuser').exists()
+
+    def test_clear_data_invalidates_cached_charts(self, populated_db):
+        """The bulk delete sends no signals, so entry versions are bumped directly."""
+        version = populated_db.profile.entry_version
+
+        call_command('clear_data', '--force', stdout=StringIO())
+
+        populated_db.profile.refresh_from_db()
+        assert populated_db.profile.entry_version > version
+
+
+# ============================================================================
+# batch_reclassify Command Tests
+# ============================================================================
+
+class FakeBatchClient:
+    """Stands in for the OpenAI client; answers every request with ``calories``."""
+
+    def __init__(self, calories=None, statuses=('in_progress', 'completed')):
+        self.calories = calories or {}
+        self.statuses = list(statuses)
+        self.uploaded = []
+        self.files = SimpleNamespace(create=self._create_file, content=self._content)
+        self.batches = SimpleNamespace(create=self._create_batch, retrieve=self._retrieve)
+
+    def _create_file(self, file, purpose):
+        self.uploaded = [json.loads(line) for line in file[1].read().splitlines()]
+        return SimpleNamespace(id='file-in')
+
+    def _create_batch(self, **kwargs):
+        return SimpleNamespace(id='batch-1', status='validating')
+
+    def _retrieve(self, batch_id):
+        status = self.statuses.pop(0) if len(self.statuses) > 1 else self.statuses[0]
+        return SimpleNamespace(id=batch_id, status=status, output_file_id='file-out')
+
+    def _content(self, file_id):
+        lines = []
+        for request in self.uploaded:
+            calories = self.calories.get(request['custom_id'])
+            reply = {'dietary': [{'item': 'x', 'calories': calories}]} if calories else {'error': 'Nope'}
+            lines.append(json.dumps({
+                'custom_id': request['custom_id'],
+                'response': {'status_code': 200, 'body': {
+                    'choices': [{'message': {'content': json.dumps(reply)}}],
+                }},
+                'error': None,
+            }))
+        return SimpleNamespace(text='\n'.join(lines))
+
+
+class TestBatchReclassifyCommand:
+    """Tests for the batch_reclassify management command."""
+
+    @pytest.fixture
+    def fake_client(self, monkeypatch):
+        client = FakeBatchClient()
+        monkeypatch.setenv('OPENAI_API_KEY', 'test-key')
+        monkeypatch.setattr('tracker.ai_service.get_openai_client', lambda api_key: client)
+        return client
+
+    def test_updates_calories_from_batch_results(self, fake_client, user):
+        """Entries get the re-estimated calories; failed lines are left alone."""
+        rice = DietaryEntry.objects.create(user=user, date=date.today(), item='Nasi lemak', calories=400)
+        tea = DietaryEntry.objects.create(user=user, date=date.today(), item='Teh tarik', calories=100)
+        DietaryEntry.objects.create(user=user, date=date.today(), item='', calories=50)
+        fake_client.calories = {str(rice.id): 650}
+        version = user.profile.entry_version
+        out = StringIO()
+
+        call_command('batch_reclassify', '--poll-interval', '0', '--force', stdout=out)
+
+        assert [line['custom_id'] for line in fake_client.uploaded] == [str(rice.id), str(tea.id)]
+        assert fake_client.uploaded[0]['url'] == '/v1/chat/completions'
+        rice.refresh_from_db()
+        tea.refresh_from_db()
+        assert rice.calories == 650
+        assert tea.calories == 100
+        user.profile.refresh_from_db()
+        assert user.profile.entry_version > version
+        assert 'updated 1 entries, 0 unchanged, 1 failed' in out.getvalue()
+
+    def test_malformed_calories_count_as_failed(self, fake_client, user):
+        """A non-numeric reply fails only its own line; the rest are still applied."""
+        rice = DietaryEntry.objects.create(user=user, date=date.today(), item='Nasi lemak', calories=400)
+        tea = DietaryEntry.objects.create(user=user, date=date.today(), item='Teh tarik', calories=100)
+        fake_client.calories = {str(rice.id): '350 kcal', str(tea.id): 150}
+        out = StringIO()
+
+        call_command('batch_reclassify', '--poll-interval', '0', '--force', stdout=out)
+
+        rice.refresh_from_db()
+        tea.refresh_from_db()
+        assert rice.calories == 400
+        assert tea.calories == 150
+        assert 'updated 1 entries, 0 unchanged, 1 failed' in out.getvalue()
+
+    def test_declining_confirmation_keeps_entries(self, fake_client, user, monkeypatch):
+        """Without --force the user is asked first, and 'no' changes nothing."""
+        rice = DietaryEntry.objects.create(user=user, date=date.today(), item='Nasi lemak', calories=400)
+        fake_client.calories = {str(rice.id): 650}
+        monkeypatch.setattr('builtins.input', lambda prompt: 'no')
+        out = StringIO()
+
+        call_command('batch_reclassify', '--poll-interval', '0', stdout=out)
+
+        rice.refresh_from_db()
+        assert rice.calories == 400
+        assert 'Aborted' in out.getvalue()
+        assert '--batch-id batch-1' in out.getvalue()
+
+    def test_dry_run_does_not_submit(self, fake_client, user):
+        """--dry-run reports the batch size without uploading anything."""
+        DietaryEntry.objects.create(user=user, date=date.today(), item='Roti canai', calories=300)
+        out = StringIO()
+
+        call_command('batch_reclassify', '--dry-run', stdout=out)
+
+        assert 'Would submit 1 entries' in out.getvalue()
+        assert fake_client.uploaded == []
+
+    def test_requires_api_key(self, db, monkeypatch):
+        """Without an API key the command fails before touching any data."""
+        monkeypatch.delenv('OPENAI_API_KEY', raising=False)
+
+        with pytest.raises(CommandError):
+            call_command('batch_reclassify')
@@ -5,9 +5,12 @@ import pytest
 import json
 from datetime import date, timedelta
 from decimal import Decimal
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 from django.contrib.auth.models import User
-from tracker.models import DietaryEntry, ExerciseEntry, WeightEntry
+from tracker.models import DietaryEntry, ExerciseEntry, WeightEntry, bump_entry_version
 
 
 # ============================================================================
@@ -100,10 +103,9 @@ class TestDashboardView:
         context = response.context
         
         heatmap_data = json.loads(context['heatmap_data'])
-        assert isinstance(heatmap_data, list)
-        # Each item should be [date_string, count]
-        if heatmap_data:
-            assert len(heatmap_data[0]) == 2
+        assert isinstance(heatmap_data, dict)
+        # Each item should be date_string: count
+        assert heatmap_data[date.today().isoformat()] == 2
     
     def test_dashboard_recent_entries_limit(self, client, db, user):
         """Test dashboard limits recent entries."""
@@ -180,6 +182,47 @@ class TestImportJsonView:
         assert '1 exercise entries' in data['message']
         assert ExerciseEntry.objects.filter(activity='Running').exists()
 
+    def test_import_json_query_count_independent_of_size(self, authenticated_client, db, user):
+        """Test import issues the same number of queries for 1 or 50 entries per model."""
+        def post_entries(n):
+            json_data = json.dumps([{
+                "date": str(date.today()),
+                "dietary": [{"item": f"Food {i}", "calories": 100} for i in range(n)],
+                "exercise": [{"activity": f"Walk {i}", "duration_minutes": 10} for i in range(n)],
+            }])
+            with CaptureQueriesContext(connection) as ctx:
+                authenticated_client.post(reverse('tracker:import_json'), {'json_data': json_data})
+            return len(ctx)
+
+        assert post_entries(1) == post_entries(50)
+        assert DietaryEntry.objects.filter(user=user).count() == 51
+        assert ExerciseEntry.objects.filter(user=user).count() == 51
+
+    def test_import_json_raw_json_body(self, authenticated_client, db, user):
+        """Test importing from an application/json request body."""
+        json_data = json.dumps([{
+            "date": str(date.today()),
+            "dietary": [{"item": "Bagel", "calories": 280}]
+        }])
+
+        response = authenticated_client.post(
+            reverse('tracker:import_json'), json_data, content_type='application/json'
+        )
+        data = response.json()
+
+        assert data['success'] is True
+        assert DietaryEntry.objects.filter(item='Bagel', user=user).exists()
+
+    def test_import_json_empty_raw_json_body(self, authenticated_client, db):
+        """Test an empty application/json body returns the missing-data error."""
+        response = authenticated_client.post(
+            reverse('tracker:import_json'), '', content_type='application/json'
+        )
+        data = response.json()
+
+        assert data['success'] is False
+        assert 'No JSON data provided' in data['error']
+
     def test_import_json_food_key_alias(self, authenticated_client, db, user):
         """Test import supports 'food' as alias for 'dietary'."""
         json_data = json.dumps([{
@@ -332,7 +375,8 @@ class TestAddWeightView:
 
         assert data['success'] is True
         assert '75.5 kg' in data['message']
-        assert WeightEntry.objects.filter(weight_kg=Decimal('75.5'), user=user).exists()
+        assert data['weight_kg'] == 75.5
+        assert WeightEntry.objects.filter(pk=data['id'], weight_kg=Decimal('75.5'), user=user).exists()
 
     def test_add_weight_without_date_uses_today(self, authenticated_client, db, user):
         """Test add weight without date uses today."""
@@ -343,7 +387,7 @@ class TestAddWeightView:
         data = response.json()
 
         assert data['success'] is True
-        entry = WeightEntry.objects.latest('id')
+        entry = WeightEntry.objects.get(pk=data['id'])
         assert entry.date == date.today()
 
     def test_add_weight_without_notes(self, authenticated_client, db, user):
@@ -468,6 +512,86 @@ class TestDailyRecapView:
         assert data['success'] is True
         assert data['summary']['total_calories_burned'] == 0
 
+    def test_daily_recap_etag_not_modified(self, authenticated_client, dietary_entry):
+        """Test a repeat request with a matching ETag gets an empty 304."""
+        url = reverse('tracker:daily_recap', args=[str(dietary_entry.date)])
+        response = authenticated_client.get(url)
+
+        assert 'private' in response['Cache-Control']
+        assert response.has_header('ETag')
+
+        repeat = authenticated_client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        assert repeat.status_code == 304
+        assert repeat.content == b''
+
+    def test_daily_recap_etag_changes_with_entries(self, authenticated_client, dietary_entry):
+        """Test adding an entry changes the ETag so the recap is refetched."""
+        url = reverse('tracker:daily_recap', args=[str(dietary_entry.date)])
+        etag = authenticated_client.get(url)['ETag']
+
+        DietaryEntry.objects.create(user=dietary_entry.user, date=dietary_entry.date, calories=120)
+        response = authenticated_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 200
+        assert len(response.json()['dietary']) == 2
+
+    def test_daily_recap_etag_changes_after_json_import(self, authenticated_client, dietary_entry):
+        """Test a bulk import through import_json changes the ETag."""
+        url = reverse('tracker:daily_recap', args=[str(dietary_entry.date)])
+        etag = authenticated_client.get(url)['ETag']
+
+        authenticated_client.post(reverse('tracker:import_json'), json.dumps([{
+            'date': str(dietary_entry.date),
+            'dietary': [{'item': 'Imported', 'calories': 250}],
+        }]), content_type='application/json')
+        response = authenticated_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 200
+        assert len(response.json()['dietary']) == 2
+
+    def test_daily_recap_etag_changes_after_bulk_create(self, authenticated_client, user):
+        """Test bump_entry_version after a bulk insert changes the ETag."""
+        today = date.today()
+        url = reverse('tracker:daily_recap', args=[str(today)])
+        etag = authenticated_client.get(url)['ETag']
+
+        DietaryEntry.objects.bulk_create([
+            DietaryEntry(user=user, date=today, item='Rice', calories=300),
+            DietaryEntry(user=user, date=today, item='Fish', calories=250),
+        ])
+        bump_entry_version(user.id)
+        response = authenticated_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 200
+        assert response['ETag'] != etag
+        assert len(response.json()['dietary']) == 2
+
+    def test_daily_recap_etag_changes_after_calorie_setup_weight(self, authenticated_client, user):
+        """Test the weigh-in logged by calorie setup changes the ETag."""
+        today = str(timezone.now().date())
+        url = reverse('tracker:daily_recap', args=[today])
+        etag = authenticated_client.get(url)['ETag']
+
+        authenticated_client.post(reverse('tracker:calorie_setup'), {
+            'fitness_goal': 'maintain', 'age': '30', 'gender': 'male',
+            'height_cm': '175', 'activity_level': 'moderate', 'initial_weight': '72.5',
+        })
+        response = authenticated_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 200
+        assert response['ETag'] != etag
+
+    def test_daily_recap_no_etag_for_non_partner(self, authenticated_client, db):
+        """Test looking up a user who isn't the partner gets no ETag."""
+        other = User.objects.create_user(username='stranger', password='pass12345')
+
+        response = authenticated_client.get(
+            reverse('tracker:daily_recap_user', args=[str(date.today()), other.pk])
+        )
+
+        assert not response.has_header('ETag')
+        assert response.json()['error'] == 'Unauthorized'
+
 
 # ============================================================================
 # URL Routing Tests
@@ -61,19 +61,50 @@ def register(request):
 import json
 from collections import defaultdict
 from django.shortcuts import render, redirect
-from django.db.models import Sum, Count, Max
-from django.http import JsonResponse
-from django.views.decorators.http import require_POST
+from django.db import transaction
+from django.db.models import Sum, Count, Max, Prefetch, prefetch_related_objects
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_POST, condition
 from django.contrib.auth.models import User
-from .models import DietaryEntry, ExerciseEntry, WeightEntry, UserProfile
+from .models import DietaryEntry, ExerciseEntry, WeightEntry, UserProfile, bump_entry_version
 
 from django.utils import timezone
-from datetime import timedelta, datetime
+from datetime import date, timedelta, datetime
 from decimal import Decimal
 from django.contrib.auth.decorators import login_required
 
 
-from django.views.decorators.cache import never_cache
+from django.core.cache import cache
+from django.views.decorators.cache import cache_control, never_cache
+
+try:
+    import orjson
+except ImportError:  # optional: fall back to the stdlib encoder/decoder
+    orjson = None
+
+
+def _json_loads(raw):
+    """Parse JSON with orjson when installed, else the stdlib json module."""
+    if orjson is None:
+        return json.loads(raw)
+    return orjson.loads(raw)
+
+
+def _json_default(obj):
+    """Encode the non-JSON types our payloads carry, the same way on both encoders."""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, date):
+        return obj.isoformat()
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+def _json_response(data):
+    """JsonResponse equivalent that serializes with orjson when installed."""
+    if orjson is None:
+        return JsonResponse(data, json_dumps_params={'default': _json_default})
+    return HttpResponse(orjson.dumps(data, default=_json_default), content_type='application/json')
+
 
 def get_partner(user):
     """Get the partner user if linked, otherwise None."""
@@ -84,20 +115,13 @@ def get_partner(user):
         return None
 
 
-@login_required
-@never_cache
-def dashboard(request, view_partner=False):
-    today = timezone.now().date()
-
-    # Determine which user's data to show
-    partner = get_partner(request.user)
-    viewing_partner = view_partner and partner is not None
-    target_user = partner if viewing_partner else request.user
+# Cached chart data is keyed by the user's entry_version, so this only bounds
+# how long an unused key lingers
+CHART_CACHE_TIMEOUT = 60 * 60
 
-    # Get calorie status for the target user
-    from .calorie_calculator import get_calorie_status
-    calorie_status = get_calorie_status(target_user)
 
+def _build_chart_data(target_user, today):
+    """Aggregate the dashboard's chart and heatmap series for ``target_user``."""
     # Find the most recent entry date to base charts on actual data
     latest_dietary = DietaryEntry.objects.filter(user=target_user).aggregate(m=Max('date'))['m']
     latest_exercise = ExerciseEntry.objects.filter(user=target_user).aggregate(m=Max('date'))['m']
@@ -111,11 +135,6 @@ def dashboard(request, view_partner=False):
         chart_end = today
         chart_start = today - timedelta(days=29)
 
-    # --- recent entries for tables (target user) ---
-    dietary_recent = DietaryEntry.objects.filter(user=target_user).order_by('-date', '-id')[:25]
-    exercise_recent = ExerciseEntry.objects.filter(user=target_user).order_by('-date', '-id')[:15]
-    weight_recent = WeightEntry.objects.filter(user=target_user).order_by('-date')[:10]
-
     # --- aggregate data for charts (based on actual data range) ---
     # Calories per day (line chart)
     cal_qs = (
@@ -138,13 +157,13 @@ def dashboard(request, view_partner=False):
     ex_values = [r['total'] or 0 for r in ex_qs]
 
     # Weight trend (line chart) - show all weight data in range
-    wt_qs = WeightEntry.objects.filter(user=target_user, date__gte=chart_start, date__lte=chart_end).order_by('date')
-    wt_dates = [str(w.date) for w in wt_qs]
-    wt_values = [float(w.weight_kg) for w in wt_qs]
-
-    # Get latest weight (regardless of date range)
-    latest_weight_entry = WeightEntry.objects.filter(user=target_user).order_by('-date').first()
-    latest_weight_value = float(latest_weight_entry.weight_kg) if latest_weight_entry else None
+    wt_qs = (
+        WeightEntry.objects.filter(user=target_user, date__gte=chart_start, date__lte=chart_end)
+        .values_list('date', 'weight_kg')
+        .order_by('date')
+    )
+    wt_dates = [str(d) for d, _ in wt_qs]
+    wt_values = [float(kg) for _, kg in wt_qs]
 
     # --- Heatmap: activity count per day (12 months back for navigation) ---
     from dateutil.relativedelta import relativedelta
@@ -153,21 +172,92 @@ def dashboard(request, view_partner=False):
     heatmap_end = (today + relativedelta(months=1)).replace(day=1) - timedelta(days=1)
 
     activity_counts = defaultdict(int)
-    # count dietary entries
-    for r in DietaryEntry.objects.filter(user=target_user, date__gte=heatmap_start, date__lte=heatmap_end).values('date').annotate(c=Count('id')):
-        activity_counts[str(r['date'])] += r['c']
-    # count exercise entries
-    for r in ExerciseEntry.objects.filter(user=target_user, date__gte=heatmap_start, date__lte=heatmap_end).values('date').annotate(c=Count('id')):
+    # count dietary, exercise and weight entries in one UNION ALL query
+    # (plain UNION would collapse days that have the same count in two tables)
+    window = dict(user=target_user, date__gte=heatmap_start, date__lte=heatmap_end)
+    per_day = [
+        model.objects.filter(**window).order_by().values('date').annotate(c=Count('id'))
+        for model in (DietaryEntry, ExerciseEntry, WeightEntry)
+    ]
+    for r in per_day[0].union(*per_day[1:], all=True):
         activity_counts[str(r['date'])] += r['c']
-    # count weight entries
-    for r in WeightEntry.objects.filter(user=target_user, date__gte=heatmap_start, date__lte=heatmap_end).values('date').annotate(c=Count('id')):
-        activity_counts[str(r['date'])] += r['c']
-    # Build list [[date, count], ...]
-    heatmap_data = [[d, c] for d, c in activity_counts.items()]
+
+    return {
+        'cal_dates': cal_dates,
+        'cal_values': cal_values,
+        'ex_dates': ex_dates,
+        'ex_values': ex_values,
+        'wt_dates': wt_dates,
+        'wt_values': wt_values,
+        # Map {date: count} so the page can look days up directly
+        'heatmap_data': dict(activity_counts),
+        'heatmap_start': heatmap_start,
+        'heatmap_end': heatmap_end,
+    }
+
+
+def get_chart_data(target_user, today):
+    """
+    Chart and heatmap series for ``target_user``, cached until their entries
+    change (or the day rolls over).
+    """
+    try:
+        version = target_user.profile.entry_version
+    except UserProfile.DoesNotExist:
+        return _build_chart_data(target_user, today)
+
+    key = f'dashboard-charts:{target_user.pk}:{version}:{today}'
+    data = cache.get(key)
+    if data is None:
+        data = _build_chart_data(target_user, today)
+        cache.set(key, data, CHART_CACHE_TIMEOUT)
+    return data
+
+
+@login_required
+@never_cache
+def dashboard(request, view_partner=False):
+    today = timezone.now().date()
+
+    # Load the profile, partner and partner's profile in one query instead of
+    # a lazy lookup for each
+    user = User.objects.select_related('profile__partner__profile').get(pk=request.user.pk)
+
+    # Determine which user's data to show
+    partner = get_partner(user)
+    viewing_partner = view_partner and partner is not None
+    target_user = partner if viewing_partner else user
+
+    # Get calorie status for the target user
+    from .calorie_calculator import get_calorie_status
+    calorie_status = get_calorie_status(target_user)
+
+    # --- recent entries for tables (target user) ---
+    # Prefetched onto the already-loaded user, so the tables and their counts
+    # come from the same evaluated lists. Only the columns the tables render are
+    # loaded (plus user, which the prefetch matches rows on), skipping remarks.
+    dietary_qs = DietaryEntry.objects.only('user', 'date', 'item', 'calories', 'notes')
+    exercise_qs = ExerciseEntry.objects.only('user', 'date', 'activity', 'duration_minutes', 'calories_burned')
+    weight_qs = WeightEntry.objects.only('user', 'date', 'weight_kg')
+    prefetch_related_objects(
+        [target_user],
+        Prefetch('dietary_entries', queryset=dietary_qs.order_by('-date', '-id')[:25], to_attr='recent_dietary'),
+        Prefetch('exercise_entries', queryset=exercise_qs.order_by('-date', '-id')[:15], to_attr='recent_exercise'),
+        Prefetch('weight_entries', queryset=weight_qs.order_by('-date')[:10], to_attr='recent_weight'),
+    )
+    dietary_recent = target_user.recent_dietary
+    exercise_recent = target_user.recent_exercise
+    weight_recent = target_user.recent_weight
+
+    # Get latest weight (regardless of date range); the recent list is already
+    # newest-first, so its head is the latest entry
+    latest_weight_value = float(weight_recent[0].weight_kg) if weight_recent else None
+
+    charts = get_chart_data(target_user, today)
 
     # Summary stats
-    total_calories = sum(cal_values)
-    total_exercise_min = sum(ex_values)
+    total_calories = sum(charts['cal_values'])
+    total_exercise_min = sum(charts['ex_values'])
 
     # Check if user's calorie profile is complete
     try:
@@ -179,25 +269,27 @@ def dashboard(request, view_partner=False):
         'dietary_recent': dietary_recent,
         'exercise_recent': exercise_recent,
         'weight_recent': weight_recent,
-        'dietary_count': dietary_recent.count(),
-        'exercise_count': exercise_recent.count(),
-        'weight_count': weight_recent.count(),
+        'dietary_count': len(dietary_recent),
+        'exercise_count': len(exercise_recent),
+        'weight_count': len(weight_recent),
         # chart data as JSON
-        'cal_dates': json.dumps(cal_dates),
-        'cal_values': json.dumps(cal_values),
-        'ex_dates': json.dumps(ex_dates),
-        'ex_values': json.dumps(ex_values),
-        'wt_dates': json.dumps(wt_dates),
-        'wt_values': json.dumps(wt_values),
+        'cal_dates': json.dumps(charts['cal_dates']),
+        'cal_values': json.dumps(charts['cal_values']),
+        'ex_dates': json.dumps(charts['ex_dates']),
+        'ex_values': json.dumps(charts['ex_values']),
+        'wt_dates': json.dumps(charts['wt_dates']),
+        'wt_values': json.dumps(charts['wt_values']),
         # heatmap (3 months)
-        'heatmap_data': json.dumps(heatmap_data),
-        'heatmap_start': str(heatmap_start),
-        'heatmap_end': str(heatmap_end),
+        'heatmap_data': json.dumps(charts['heatmap_data']),
+        'heatmap_start': str(charts['heatmap_start']),
+        'heatmap_end': str(charts['heatmap_end']),
         'today': str(today),
         # summary
         'total_calories': total_calories,
         'total_exercise_min': total_exercise_min,
         'latest_weight': latest_weight_value,
+        # Preloaded user (with profile) so base.html doesn't look it up again
+        'user': user,
         # Partner/couples mode
         'viewing_partner': viewing_partner,
         'partner': partner,
@@ -222,17 +314,22 @@ def partner_dashboard(request):
 def import_json(request):
     """Import activity data from JSON (dietary and exercise entries)."""
     try:
-        raw_json = request.POST.get('json_data', '').strip()
+        # JSON bodies are parsed straight from the raw bytes; form posts carry
+        # the payload in a json_data field
+        if request.content_type == 'application/json':
+            raw_json = request.body.strip()
+        else:
+            raw_json = request.POST.get('json_data', '').strip()
         if not raw_json:
-            return JsonResponse({'success': False, 'error': 'No JSON data provided'})
+            return _json_response({'success': False, 'error': 'No JSON data provided'})
 
-        data = json.loads(raw_json)
+        data = _json_loads(raw_json)
         if not isinstance(data, list):
-            return JsonResponse({'success': False, 'error': 'JSON must be a list/array of day objects'})
+            return _json_response({'success': False, 'error': 'JSON must be a list/array of day objects'})
 
         user = request.user
-        dietary_count = 0
-        exercise_count = 0
+        dietary_objs = []
+        exercise_objs = []
         skipped_days = 0
 
         for entry in data:
@@ -246,7 +343,8 @@ def import_json(request):
                 continue
 
             try:
-                entry_date = datetime.strptime(date_str, '%Y-%m-%d').date()
+                # fromisoformat skips strptime's format-string parsing per row
+                entry_date = date.fromisoformat(date_str)
             except ValueError:
                 skipped_days += 1
                 continue
@@ -286,8 +384,7 @@ def import_json(request):
                 if hasattr(DietaryEntry, "remarks"):
                     create_kwargs["remarks"] = item_remarks
 
-                DietaryEntry.objects.create(**create_kwargs)
-                dietary_count += 1
+                dietary_objs.append(DietaryEntry(**create_kwargs))
 
             # Exercise list
             exercise_items = entry.get('exercise') or []
@@ -305,32 +402,37 @@ def import_json(request):
 
                 ex_remarks = (ex.get('remarks') or "").strip() or day_remarks
 
-                ExerciseEntry.objects.create(
+                exercise_objs.append(ExerciseEntry(
                     user=user,
                     date=entry_date,
                     activity=ex.get('activity', '') or '',
                     duration_minutes=duration or 0,
                     calories_burned=ex.get('calories_burned', 0) or 0,
                     remarks=ex_remarks
-                )
-                exercise_count += 1
+                ))
+
+        # One multi-row INSERT per model instead of one round-trip per entry
+        with transaction.atomic():
+            DietaryEntry.objects.bulk_create(dietary_objs, batch_size=500)
+            ExerciseEntry.objects.bulk_create(exercise_objs, batch_size=500)
+            # bulk_create skips post_save, so invalidate the cached charts here
+            bump_entry_version(user.id)
 
-        msg = f'Imported {dietary_count} dietary and {exercise_count} exercise entries.'
+        msg = f'Imported {len(dietary_objs)} dietary and {len(exercise_objs)} exercise entries.'
         if skipped_days:
             msg += f' Skipped {skipped_days} invalid day record(s).'
 
-        return JsonResponse({'success': True, 'message': msg})
+        return _json_response({'success': True, 'message': msg})
 
     except json.JSONDecodeError:
-        return JsonResponse({'success': False, 'error': 'Invalid JSON (could not parse).'})
+        return _json_response({'success': False, 'error': 'Invalid JSON (could not parse).'})
     except Exception as e:
-        return JsonResponse({'success': False, 'error': str(e)})
+        return _json_response({'success': False, 'error': str(e)})
 
 
 
 @require_POST
 @login_required
-@login_required
 def add_weight(request):
     """Add a new weight entry."""
     try:
@@ -341,13 +443,18 @@ def add_weight(request):
             return JsonResponse({'success': False, 'error': 'Weight is required'})
         user = request.user
         entry_date = datetime.strptime(date_str, '%Y-%m-%d').date() if date_str else timezone.localtime().date()
-        WeightEntry.objects.create(
+        entry = WeightEntry.objects.create(
             user=user,
             date=entry_date,
             weight_kg=Decimal(weight_kg),
             notes=notes
         )
-        return JsonResponse({'success': True, 'message': f'Weight {weight_kg} kg recorded for {entry_date}.'})
+        return JsonResponse({
+            'success': True,
+            'message': f'Weight {weight_kg} kg recorded for {entry_date}.',
+            'id': entry.pk,
+            'weight_kg': float(entry.weight_kg),
+        })
     except Exception as e:
         return JsonResponse({'success': False, 'error': str(e)})
 
@@ -357,7 +464,23 @@ def guide(request):
     return render(request, 'tracker/guide.html')
 
 
+def _daily_recap_etag(request, date_str, user_id=None):
+    """
+    ETag for a day's recap, derived from the target user's entry_version so it
+    changes whenever their entries do. None (no ETag) for non-partner lookups.
+    """
+    profiles = UserProfile.objects.filter(user_id=user_id or request.user.pk)
+    if user_id:
+        profiles = profiles.filter(user__partner_of__user=request.user)
+    version = profiles.values_list('entry_version', flat=True).first()
+    if version is None:
+        return None
+    return f'{user_id or request.user.pk}-{version}-{date_str}'
+
+
 @login_required
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=_daily_recap_etag)
 def daily_recap(request, date_str, user_id=None):
     """Get daily recap data for a specific date."""
     try:
@@ -365,23 +488,26 @@ def daily_recap(request, date_str, user_id=None):
 
         # Determine which user's data to fetch
         if user_id:
-            # Verify the user_id is the current user's partner
-            partner = get_partner(request.user)
-            if partner and partner.id == user_id:
-                target_user = partner
-            else:
-                return JsonResponse({'success': False, 'error': 'Unauthorized'})
+            # Verify the user_id is the current user's partner; partner_id reads
+            # the FK column, so the partner's User row is never loaded
+            try:
+                partner_id = request.user.profile.partner_id
+            except UserProfile.DoesNotExist:
+                partner_id = None
+            if partner_id is None or partner_id != user_id:
+                return _json_response({'success': False, 'error': 'Unauthorized'})
+            target_user_id = partner_id
         else:
-            target_user = request.user
+            target_user_id = request.user.pk
 
         # Get all entries for this date
-        dietary = list(DietaryEntry.objects.filter(user=target_user, date=entry_date).values(
+        dietary = list(DietaryEntry.objects.filter(user_id=target_user_id, date=entry_date).values(
             'item', 'calories', 'notes', 'remarks'
         ))
-        exercise = list(ExerciseEntry.objects.filter(user=target_user, date=entry_date).values(
+        exercise = list(ExerciseEntry.objects.filter(user_id=target_user_id, date=entry_date).values(
             'activity', 'duration_minutes', 'calories_burned', 'remarks'
         ))
-        weight = list(WeightEntry.objects.filter(user=target_user, date=entry_date).values(
+        weight = list(WeightEntry.objects.filter(user_id=target_user_id, date=entry_date).values(
             'weight_kg', 'notes'
         ))
         
@@ -390,10 +516,6 @@ def daily_recap(request, date_str, user_id=None):
         total_calories_burned = sum(e['calories_burned'] or 0 for e in exercise)
         total_exercise_min = sum(e['duration_minutes'] or 0 for e in exercise)
         
-        # Convert Decimal to float for JSON serialization
-        for w in weight:
-            w['weight_kg'] = float(w['weight_kg'])
-        
         # Collect all unique non-empty remarks from dietary and exercise entries
         all_remarks = []
         seen_remarks = set()
@@ -412,7 +534,7 @@ def daily_recap(request, date_str, user_id=None):
                 all_remarks.append(remark)
                 seen_remarks.add(remark)
 
-        return JsonResponse({
+        return _json_response({
             'success': True,
             'date': date_str,
             'dietary': dietary,
@@ -427,7 +549,7 @@ def daily_recap(request, date_str, user_id=None):
             }
         })
     except Exception as e:
-        return JsonResponse({'success': False, 'error': str(e)})
+        return _json_response({'success': False, 'error': str(e)})
 
 
 # --- AI Food Logging Views ---
@@ -441,6 +563,25 @@ def ai_food_log(request):
     return render(request, 'tracker/ai_food_log.html')
 
 
+def _ai_parse_events(events, user, request_type, remaining):
+    """
+    Format AIFoodLogService stream events as Server-Sent Events, logging AI
+    usage once the final result arrives.
+    """
+    from .rate_limit import log_ai_usage
+
+    for event, payload in events:
+        if event == 'result':
+            log_ai_usage(
+                user,
+                request_type,
+                success=payload.get('success', False),
+                error_message=payload.get('error', '') if not payload.get('success') else ''
+            )
+            payload['remaining'] = remaining
+        yield f'event: {event}\ndata: {json.dumps(payload)}\n\n'
+
+
 @require_POST
 @login_required
 def ai_parse_food(request):
@@ -482,6 +623,9 @@ def ai_parse_food(request):
 
         service = AIFoodLogService(user_context=user_context)
 
+        # Clients that accept Server-Sent Events get each item as it is parsed
+        stream = 'text/event-stream' in request.headers.get('Accept', '')
+
         # Check if this is a text or image request
         text_input = request.POST.get('text', '').strip()
         image_file = request.FILES.get('image')
@@ -497,13 +641,29 @@ def ai_parse_food(request):
                 log_ai_usage(request.user, request_type, success=False, error_message='Image too large')
                 return JsonResponse({'success': False, 'error': 'Image too large (max 10MB)'})
 
-            result = service.parse_image_input(image_data, content_type, context)
+            if stream:
+                events = service.stream_image_input(image_data, content_type, context)
+            else:
+                result = service.parse_image_input(image_data, content_type, context)
         elif text_input:
             # Handle text input
-            result = service.parse_text_input(text_input)
+            if stream:
+                events = service.stream_text_input(text_input)
+            else:
+                result = service.parse_text_input(text_input)
         else:
             return JsonResponse({'success': False, 'error': 'No text or image provided'})
 
+        if stream:
+            response = StreamingHttpResponse(
+                _ai_parse_events(events, request.user, request_type, remaining),
+                content_type='text/event-stream'
+            )
+            response['Cache-Control'] = 'no-cache'
+            # Ask nginx-style proxies to pass events through unbuffered
+            response['X-Accel-Buffering'] = 'no'
+            return response
+
         # Log usage
         log_ai_usage(
             request.user,